@@ -7,7 +7,7 @@ bl_info = {
 }
 
 import bpy, os
-from . import ui, pref, ops, addon
+from . import ui, pref, ops, addon, utils
 
 ADDON_ID = __name__
 ADDON_DIR = os.path.dirname(__file__)
@@ -18,6 +18,7 @@ ADDON_DIR = os.path.dirname(__file__)
 # ------------------------------------------------------------------------
 
 modules = [
+    utils,
     pref,
     ops,
     addon,
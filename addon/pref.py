@@ -16,12 +16,49 @@ except Exception:
 class AddOnPreferences(bpy.types.AddonPreferences):
     bl_idname = ADDON_ID
 
+    # Rig detection (Lighting Setup); read by utils.rig_index, which rescores when these change
+    rig_name_keywords: bpy.props.StringProperty(
+        name="Name Keywords",
+        description="Comma-separated words; an armature whose name contains one is likely the rig",
+        default="rig",
+    )
+    rig_name_prefixes: bpy.props.StringProperty(
+        name="Name Prefixes",
+        description="Comma-separated prefixes; an armature whose name starts with one is likely the rig",
+        default="rg",
+    )
+    rig_name_score: bpy.props.IntProperty(
+        name="Name Match",
+        description="Score added when the name matches a keyword or prefix",
+        default=2, min=0, max=10,
+    )
+    rig_bones_score: bpy.props.IntProperty(
+        name="Has Bones",
+        description="Score added when the armature has at least one bone",
+        default=1, min=0, max=10,
+    )
+    rig_props_score: bpy.props.IntProperty(
+        name="Has Custom Properties",
+        description="Score added when the object has custom properties (common on rig controllers)",
+        default=1, min=0, max=10,
+    )
+
     def draw(self, context):
         layout = self.layout
 
         # Draw the Graph New Window preferences UI
         GraphNewWindowPrefUI(layout, context).draw()
 
+        # Rig detection scoring for the lighting setup
+        layout.label(text="Lighting Setup Rig Detection:", icon='ARMATURE_DATA')
+        col = layout.column(align=True)
+        col.prop(self, "rig_name_keywords")
+        col.prop(self, "rig_name_prefixes")
+        col = layout.column(align=True)
+        col.prop(self, "rig_name_score")
+        col.prop(self, "rig_bones_score")
+        col.prop(self, "rig_props_score")
+
 
 def register():
     bpy.utils.register_class(AddOnPreferences)
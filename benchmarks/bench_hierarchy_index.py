@@ -0,0 +1,134 @@
+"""
+Compare recursive collection path/holder lookups with utils.hierarchy_index.HierarchyIndex.
+
+Runs in plain Python on a synthetic collection tree (no Blender needed):
+    python benchmarks/bench_hierarchy_index.py
+Results are also appended to bench_output.txt next to the add-on.
+"""
+import importlib.util, os, random, sys, time
+
+ADDON_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Load the module by path: importing the utils package would pull in bpy
+_spec = importlib.util.spec_from_file_location(
+    "hierarchy_index", os.path.join(ADDON_ROOT, "utils", "hierarchy_index.py"))
+hierarchy_index = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(hierarchy_index)
+
+COLLECTIONS = 5_000
+FANOUT = 6
+SHARED_LINKS = 250  # extra parents, so some collections are multi-parent
+QUERIES = 500
+REPEATS = 3
+
+
+# ------------------------------------------------------------------------
+# Stand-ins for bpy.types.Collection / Object
+# ------------------------------------------------------------------------
+class FakeObject:
+    __slots__ = ("name", "instance_type", "instance_collection")
+
+    def __init__(self, name, instance_collection=None):
+        self.name = name
+        self.instance_type = 'COLLECTION' if instance_collection else 'NONE'
+        self.instance_collection = instance_collection
+
+
+class FakeCollection:
+    __slots__ = ("name", "children", "objects")
+
+    def __init__(self, name):
+        self.name = name
+        self.children = []
+        self.objects = []
+
+
+def build_tree(count):
+    rng = random.Random(1)
+    root = FakeCollection("Scene Collection")
+    colls = [root]
+    for i in range(count):
+        coll = FakeCollection(f"coll_{i:05d}")
+        colls[i // FANOUT].children.append(coll)
+        coll.objects.append(FakeObject(f"obj_{i:05d}"))
+        colls.append(coll)
+    for _ in range(SHARED_LINKS):
+        parent, child = rng.sample(colls[1:], 2)
+        if child not in parent.children:
+            parent.children.append(child)
+    # An instancing cycle: two collections instance each other
+    colls[1].objects.append(FakeObject("inst_a", colls[2]))
+    colls[2].objects.append(FakeObject("inst_b", colls[1]))
+    return root, colls
+
+
+# ------------------------------------------------------------------------
+# Reference: the original recursive helpers from override_fog_materials.py
+# ------------------------------------------------------------------------
+def path_recursive(root_col, target):
+    if root_col == target:
+        return [root_col]
+    for c in root_col.children:
+        path = path_recursive(c, target)
+        if path:
+            return [root_col] + path
+    return []
+
+
+def holder_recursive(root, child):
+    for c in root.children:
+        if c == child:
+            return root
+        h = holder_recursive(c, child)
+        if h:
+            return h
+    return None
+
+
+def query_recursive(root, targets):
+    return [(path_recursive(root, t), holder_recursive(root, t)) for t in targets]
+
+
+def query_indexed(root, targets):
+    index = hierarchy_index.HierarchyIndex([root], follow_instances=True)
+    return [(index.path(t), index.holder(t)) for t in targets]
+
+
+def check_paths(root, targets):
+    """Indexed paths must be valid root->target chains no longer than the recursive ones."""
+    for (rec_path, _), (idx_path, idx_holder) in zip(query_recursive(root, targets), query_indexed(root, targets)):
+        assert idx_path[0] is root and idx_path[-1] is rec_path[-1]
+        assert len(idx_path) <= len(rec_path)
+        assert all(b in a.children for a, b in zip(idx_path, idx_path[1:]))
+        assert idx_holder is idx_path[-2]
+
+
+def best_of(fn, *args):
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10_000))
+    root, colls = build_tree(COLLECTIONS)
+    targets = random.Random(2).sample(colls[1:], QUERIES)
+    check_paths(root, targets)
+
+    recursive = best_of(query_recursive, root, targets)
+    indexed = best_of(query_indexed, root, targets)
+    lines = [
+        f"{'collections':>11} {'queries':>8} {'recursive':>10} {'index':>8} {'speedup':>8}",
+        f"{COLLECTIONS:>11} {QUERIES:>8} {recursive:>9.3f}s {indexed:>7.3f}s {recursive / indexed:>7.1f}x",
+    ]
+    print("\n".join(lines))
+
+    with open(os.path.join(ADDON_ROOT, "bench_output.txt"), "a", encoding="utf-8") as f:
+        f.write("Collection hierarchy path queries (index build included)\n" + "\n".join(lines) + "\n\n")
+
+
+if __name__ == "__main__":
+    main()
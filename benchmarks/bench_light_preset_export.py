@@ -0,0 +1,116 @@
+"""
+Compare the per-attribute light preset export loop with the batched foreach_get path.
+
+Run from a shell (results also go to bench_output.txt next to the add-on):
+    blender -b --factory-startup --python benchmarks/bench_light_preset_export.py
+"""
+import bpy, importlib, os, sys, time
+from collections import defaultdict
+
+ADDON_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(ADDON_ROOT))
+light_preset = importlib.import_module(f"{os.path.basename(ADDON_ROOT)}.utils.light_preset")
+
+SIZES = (1_000, 10_000, 50_000)
+LIGHT_TYPES = ('POINT', 'SPOT', 'AREA', 'SUN')
+COLLECTIONS = 100
+REPEATS = 3
+
+
+# ------------------------------------------------------------------------
+# Reference: the original per-light, per-attribute export loop
+# ------------------------------------------------------------------------
+def export_per_attribute(lights):
+    by_collection = defaultdict(list)
+    for o in lights:
+        parent_collection = o.users_collection[0].name if o.users_collection else "NoCollection"
+        by_collection[parent_collection].append({
+            "name": o.name,
+            "color": tuple(float(c) for c in o.data.color[:3]),
+            "energy": float(o.data.energy),
+            "exposure": float(o.data.exposure),
+            "shadow_jitter_overblur": float(o.data.shadow_jitter_overblur),
+        })
+    return [{"collection": cname, "preset": items} for cname, items in by_collection.items()]
+
+
+def export_batched(lights):
+    return light_preset.LightPresetTable.from_objects(lights).to_payload()
+
+
+# ------------------------------------------------------------------------
+# Scene setup
+# ------------------------------------------------------------------------
+def reset_data():
+    for pool in (bpy.data.objects, bpy.data.lights, bpy.data.collections):
+        bpy.data.batch_remove(list(pool))
+
+
+def build_lights(count):
+    reset_data()
+    scene = bpy.context.scene
+    colls = []
+    for c in range(COLLECTIONS):
+        coll = bpy.data.collections.new(f"c-bench{c:03d}")
+        scene.collection.children.link(coll)
+        colls.append(coll)
+
+    objs = []
+    for i in range(count):
+        # Mixed types: energy lives on the subtypes, so this exercises the mixed-type foreach path
+        data = bpy.data.lights.new(f"light_{i:05d}", type=LIGHT_TYPES[i % len(LIGHT_TYPES)])
+        data.energy = float(i % 100)
+        obj = bpy.data.objects.new(f"light_{i:05d}", data)
+        colls[i % COLLECTIONS].objects.link(obj)
+        objs.append(obj)
+    return objs
+
+
+def check_same_payload(expected, actual):
+    """Both paths must export the same collections, names and values."""
+    assert [e["collection"] for e in expected] == [a["collection"] for a in actual]
+    for e, a in zip(expected, actual):
+        for e_item, a_item in zip(e["preset"], a["preset"], strict=True):
+            assert e_item["name"] == a_item["name"]
+            assert list(e_item["color"]) == a_item["color"]
+            assert e_item["energy"] == a_item["energy"]
+
+
+def check_energy_round_trip(objs):
+    """Export, reset energy, re-import: every light must get its exported energy back."""
+    expected = [o.data.energy for o in objs]
+    table = light_preset.LightPresetTable.from_objects(objs)
+    assert "energy" in table.columns, "energy is missing from the batched preset columns"
+    payload = table.to_payload()
+    for o in objs:
+        o.data.energy = -1.0
+    light_preset.apply_light_preset(light_preset.LightPresetTable.from_payload(payload))
+    assert [o.data.energy for o in objs] == expected, "energy did not survive export + re-import"
+
+
+def best_of(fn, *args):
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    lines = [f"{'lights':>8} {'per-attribute':>14} {'foreach_get':>12} {'speedup':>8}"]
+    for count in SIZES:
+        objs = build_lights(count)
+        check_same_payload(export_per_attribute(objs), export_batched(objs))
+        check_energy_round_trip(objs)
+        legacy = best_of(export_per_attribute, objs)
+        batched = best_of(export_batched, objs)
+        lines.append(f"{count:>8} {legacy:>13.3f}s {batched:>11.3f}s {legacy / batched:>7.1f}x")
+        print(lines[-1])
+
+    with open(os.path.join(ADDON_ROOT, "bench_output.txt"), "a", encoding="utf-8") as f:
+        f.write("Light preset export\n" + "\n".join(lines) + "\n\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Compare the append and link-with-override lighting setup modes on a 40-character test file:
+saved .blend size and the time to open it again.
+
+Run from a shell (results also go to bench_output.txt next to the add-on):
+    blender -b --factory-startup --python benchmarks/bench_lighting_setup_modes.py
+"""
+import bpy, importlib, os, sys, tempfile, time
+
+ADDON_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(ADDON_ROOT))
+addon = importlib.import_module(os.path.basename(ADDON_ROOT))
+
+CHARACTERS = 40
+LOAD_REPEATS = 3
+
+
+# ------------------------------------------------------------------------
+# Scene setup
+# ------------------------------------------------------------------------
+def build_characters(count):
+    """One 'c-charNN' collection per character, each holding an armature with a 'c_traj' bone."""
+    scene = bpy.context.scene
+    for i in range(count):
+        coll = bpy.data.collections.new(f"c-char{i:02d}")
+        scene.collection.children.link(coll)
+        arm = bpy.data.armatures.new(f"char{i:02d}_rig")
+        rig = bpy.data.objects.new(f"char{i:02d}_rig", arm)
+        rig.location.x = i * 2.0
+        coll.objects.link(rig)
+
+        bpy.context.view_layer.objects.active = rig
+        bpy.ops.object.mode_set(mode='EDIT')
+        bone = arm.edit_bones.new("c_traj")
+        bone.tail = (0.0, 0.5, 0.0)
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+
+def run_mode(use_override, path):
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    build_characters(CHARACTERS)
+    scene = bpy.context.scene
+    scene.lighting_setup.use_library_override = use_override
+
+    start = time.perf_counter()
+    bpy.ops.bls.batch_append_blend('EXEC_DEFAULT', scope='ALL')
+    setup = time.perf_counter() - start
+
+    bpy.ops.wm.save_as_mainfile(filepath=path, compress=False)
+    size = os.path.getsize(path)
+
+    load = float("inf")
+    for _ in range(LOAD_REPEATS):
+        start = time.perf_counter()
+        bpy.ops.wm.open_mainfile(filepath=path, load_ui=False)
+        load = min(load, time.perf_counter() - start)
+    return setup, size, load
+
+
+def main():
+    addon.register()
+    lines = [f"{'mode':>9} {'setup':>8} {'file size':>12} {'load':>8}"]
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, use_override in (("append", False), ("override", True)):
+            setup, size, load = results[name] = run_mode(use_override, os.path.join(tmp, f"{name}.blend"))
+            lines.append(f"{name:>9} {setup:>7.3f}s {size / 1024:>9.0f} KiB {load:>7.3f}s")
+            print(lines[-1])
+    (_a_setup, a_size, a_load), (_o_setup, o_size, o_load) = results["append"], results["override"]
+    lines.append(f"override vs append: file size {o_size / a_size:.2f}x, load time {o_load / a_load:.2f}x "
+                 f"({CHARACTERS} characters)")
+    print(lines[-1])
+
+    with open(os.path.join(ADDON_ROOT, "bench_output.txt"), "a", encoding="utf-8") as f:
+        f.write("Lighting setup: append vs link with override\n" + "\n".join(lines) + "\n\n")
+
+
+if __name__ == "__main__":
+    main()
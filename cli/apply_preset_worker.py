@@ -0,0 +1,70 @@
+"""
+Apply a lighting preset to the open .blend file and save it.
+Started by batch_apply_preset.py, one background Blender per file:
+
+    blender -b shot.blend --python cli/apply_preset_worker.py -- --preset lights.json [--dry-run] [--no-save]
+
+Uses the same preset loading/diff/apply code as blp.import_lighting_preset and prints a single
+`BLP_RESULT {...}` JSON line for the driver to collect.
+"""
+import argparse, importlib, json, os, sys, time, traceback
+import bpy
+
+RESULT_PREFIX = "BLP_RESULT "
+ADDON_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_args():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(prog="apply_preset_worker")
+    parser.add_argument("--preset", required=True, help="Lighting preset (.json or .npz)")
+    parser.add_argument("--dry-run", action="store_true", help="Report changes without writing or saving")
+    parser.add_argument("--no-save", action="store_true", help="Apply but do not save the .blend")
+    return parser.parse_args(argv)
+
+
+def import_light_preset():
+    """Import the add-on's light_preset module straight from this checkout."""
+    sys.path.insert(0, os.path.dirname(ADDON_ROOT))
+    return importlib.import_module(f"{os.path.basename(ADDON_ROOT)}.utils.light_preset")
+
+
+def main():
+    args = parse_args()
+    result = {"file": bpy.data.filepath, "ok": False, "saved": False, "timings": {}}
+    timings = result["timings"]
+    try:
+        light_preset = import_light_preset()
+
+        start = time.perf_counter()
+        table = light_preset.load_preset_table(os.path.abspath(args.preset))
+        if table is None:
+            raise RuntimeError(f"Failed to load preset from {args.preset}")
+        timings["load"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        stats = light_preset.apply_light_preset(table, dry_run=args.dry_run)
+        timings["apply"] = time.perf_counter() - start
+
+        if stats["changed"] and not (args.dry_run or args.no_save):
+            start = time.perf_counter()
+            bpy.ops.wm.save_mainfile()
+            timings["save"] = time.perf_counter() - start
+            result["saved"] = True
+
+        result.update(
+            ok=True,
+            applied=stats["changed"],
+            unchanged=stats["unchanged"],
+            skipped=stats["skipped"],
+            missing_collections=stats["missing_collections"],
+        )
+    except Exception as e:
+        result["error"] = f"{e}\n{traceback.format_exc()}"
+
+    print(RESULT_PREFIX + json.dumps(result), flush=True)
+    sys.exit(0 if result["ok"] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Push one lighting preset to many .blend files using a pool of background Blender processes.
+
+    python cli/batch_apply_preset.py --preset lights.json shots/*.blend
+    python cli/batch_apply_preset.py --preset lights.npz --blender /opt/blender/blender --jobs 8 --report out.json shots/*.blend
+
+Each file is opened by its own `blender -b` worker (apply_preset_worker.py), which applies the preset
+through the add-on's import code, saves, and reports JSON back. At most --jobs workers run at once
+(default: CPU count); a crash or error in one file is recorded and the others keep going.
+Runs with any Python 3; bpy is only needed inside the workers.
+"""
+import argparse, json, os, subprocess, sys, time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+WORKER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "apply_preset_worker.py")
+RESULT_PREFIX = "BLP_RESULT "
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Apply a lighting preset to many .blend files.")
+    parser.add_argument("files", nargs="+", help=".blend files to update")
+    parser.add_argument("--preset", required=True, help="Lighting preset (.json or .npz)")
+    parser.add_argument("--blender", default=os.environ.get("BLENDER", "blender"),
+                        help="Blender executable (default: $BLENDER or 'blender')")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                        help="Parallel Blender processes (default: CPU count)")
+    parser.add_argument("--timeout", type=float, default=900.0, help="Seconds before a worker is killed")
+    parser.add_argument("--dry-run", action="store_true", help="Report changes without writing or saving")
+    parser.add_argument("--no-save", action="store_true", help="Apply but do not save the files")
+    parser.add_argument("--report", help="Also write the JSON report to this path")
+    return parser.parse_args(argv)
+
+
+def run_worker(args, blend_path):
+    """Run one background Blender on blend_path and return its result dict."""
+    cmd = [args.blender, "-b", "--factory-startup", blend_path, "--python", WORKER, "--",
+           "--preset", os.path.abspath(args.preset)]
+    if args.dry_run:
+        cmd.append("--dry-run")
+    if args.no_save:
+        cmd.append("--no-save")
+
+    start = time.perf_counter()
+    try:
+        proc = subprocess.run(cmd, capture_output=True, text=True, timeout=args.timeout)
+    except subprocess.TimeoutExpired:
+        return {"file": blend_path, "ok": False, "error": f"Timed out after {args.timeout:.0f}s",
+                "wall": time.perf_counter() - start}
+    except OSError as e:
+        return {"file": blend_path, "ok": False, "error": f"Could not start Blender: {e}", "wall": 0.0}
+
+    result = None
+    error = f"Worker exited with code {proc.returncode} without a result"
+    for line in proc.stdout.splitlines():
+        if line.startswith(RESULT_PREFIX):
+            try:
+                result = json.loads(line[len(RESULT_PREFIX):])
+            except ValueError as e:
+                # Truncated or interleaved output; report it like a missing result
+                result, error = None, f"Worker printed an unreadable result ({e})"
+    if not isinstance(result, dict):
+        tail = proc.stdout.strip().splitlines()[-10:] + proc.stderr.strip().splitlines()[-10:]
+        result = {"file": blend_path, "ok": False, "error": f"{error}:\n" + "\n".join(tail)}
+    result["file"] = blend_path
+    result["wall"] = time.perf_counter() - start
+    return result
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    # Each file once: two workers saving the same .blend at the same time would clobber it
+    files = list(dict.fromkeys(os.path.realpath(f) for f in args.files))
+    if len(files) != len(args.files):
+        print(f"Ignoring {len(args.files) - len(files)} duplicate path(s).", file=sys.stderr)
+    jobs = max(1, min(args.jobs, len(files)))
+
+    results = [None] * len(files)
+    done = 0
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = {pool.submit(run_worker, args, f): i for i, f in enumerate(files)}
+        for future in as_completed(futures):
+            result = results[futures[future]] = future.result()
+            done += 1
+            status = "ok" if result["ok"] else "FAILED"
+            print(f"[{done}/{len(files)}] {status}: {result['file']} "
+                  f"(applied {result.get('applied', 0)}, skipped {result.get('skipped', 0)}, "
+                  f"{result['wall']:.1f}s)", file=sys.stderr)
+
+    report = {
+        "preset": os.path.abspath(args.preset),
+        "jobs": jobs,
+        "wall": time.perf_counter() - start,
+        "succeeded": sum(r["ok"] for r in results),
+        "failed": sum(not r["ok"] for r in results),
+        "results": results,
+    }
+    text = json.dumps(report, indent=4)
+    print(text)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            f.write(text)
+    return 0 if not report["failed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
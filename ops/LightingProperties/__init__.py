@@ -1,9 +1,14 @@
-from . import library_override, export_import_preset, override_fog_materials
+from . import (library_override, export_import_preset, override_fog_materials, light_groups,
+               preset_snapshots, import_preset_async, override_batch)
 
 modules = [
     library_override,
     export_import_preset,
-    override_fog_materials
+    override_fog_materials,
+    light_groups,
+    preset_snapshots,
+    import_preset_async,
+    override_batch,
 ]
 
 
@@ -1,14 +1,21 @@
 import bpy
-from collections import defaultdict
-from ...utils.json_manager import JSONManager
+from ...utils.light_index import find_objects_by_key
+from ...utils.light_preset import (LightPresetTable, PRESET_EXTENSIONS, apply_light_preset,
+                                   load_preset_table, save_preset_table)
 
 
 # ------------------------------------------------------------------------
 # Helpers
 # ------------------------------------------------------------------------
-def find_objects_by_key(key: str):
-    """All objects that have the given custom property key."""
-    return [obj for obj in bpy.data.objects if key in obj.keys()]
+def report_preset_stats(reporter, stats, dry_run=False):
+    """Report the result of apply_light_preset through an operator's report()."""
+    for cname in stats["missing_collections"]:
+        reporter({'WARNING'}, f"Collection '{cname}' not found; skipping.")
+
+    verb = "would change" if dry_run else "changed"
+    reporter({'INFO'},
+             (f"{'Dry run: ' if dry_run else ''}{stats['changed']} light(s) {verb} | "
+              f"Unchanged: {stats['unchanged']} | Skipped: {stats['skipped']}"))
 
 
 # ------------------------------------------------------------------------
@@ -23,9 +30,14 @@ class ExportLightingPresetOperator(bpy.types.Operator):
     # File browser props
     filepath: bpy.props.StringProperty(subtype='FILE_PATH')
     filter_glob: bpy.props.StringProperty(
-        default="*.json",
+        default="*.json;*.npz",
         options={'HIDDEN'}
     )
+    compress: bpy.props.BoolProperty(
+        name="Compress",
+        description="zlib-compress .npz presets (ignored for .json)",
+        default=True,
+    )
 
     def invoke(self, context, event):
         s = context.scene
@@ -45,40 +57,21 @@ class ExportLightingPresetOperator(bpy.types.Operator):
         key = props.key
 
         # Get light objects
-        lights = [o for o in find_objects_by_key(key) if o.type == 'LIGHT' and getattr(o, "data", None)]
-
-        # Prepare payload
-        by_collection = defaultdict(list)
-        for o in lights:
-            # Get parent collection name (handle cases where object may not belong to a collection)
-            parent_collection = o.users_collection[0].name if o.users_collection else "NoCollection"
-
-            # Light data
-            col = tuple(float(c) for c in o.data.color[:3])
-            energy = float(o.data.energy)
-            exposure = float(o.data.exposure)
-            shadow_jitter_overblur = float(o.data.shadow_jitter_overblur)
-
-            by_collection[parent_collection].append({
-                "name": o.name,
-                "color": col,
-                "energy": energy,
-                "exposure": exposure,
-                "shadow_jitter_overblur": shadow_jitter_overblur,
-            })
-
-        payload = [{"collection": cname, "preset": items} for cname, items in by_collection.items()]
+        lights = [o for o in find_objects_by_key(key, scene=s) if o.type == 'LIGHT' and getattr(o, "data", None)]
+
+        # Batched foreach_get reads into columns; serialized as JSON or packed .npz by extension
+        table = LightPresetTable.from_objects(lights)
 
         # Resolve/ensure path
         path = self.filepath or ""
         if not path:
             self.report({'ERROR'}, "No file path selected.")
             return {'CANCELLED'}
-        if not path.lower().endswith(".json"):
+        if not path.lower().endswith(PRESET_EXTENSIONS):
             path += ".json"
         abs_path = bpy.path.abspath(path)
 
-        JSONManager.save_json(data=payload, filepath=abs_path)
+        save_preset_table(table, abs_path, compress=self.compress)
 
         return {'FINISHED'}
 
@@ -91,9 +84,14 @@ class ImportLightingPresetOperator(bpy.types.Operator):
     # File browser props
     filepath: bpy.props.StringProperty(subtype='FILE_PATH')
     filter_glob: bpy.props.StringProperty(
-        default="*.json",
+        default="*.json;*.npz",
         options={'HIDDEN'}
     )
+    dry_run: bpy.props.BoolProperty(
+        name="Dry Run",
+        description="Only report how many lights would change, without writing anything",
+        default=False,
+    )
 
     def invoke(self, context, event):
         s = context.scene
@@ -114,46 +112,15 @@ class ImportLightingPresetOperator(bpy.types.Operator):
 
         # Resolve path
         path = bpy.path.abspath(self.filepath)
-        data = JSONManager.load_json(filepath=path)
-        if data is None:
+        table = load_preset_table(path)
+        if table is None:
             self.report({'ERROR'}, f"Failed to load preset from {path}")
             return {'CANCELLED'}
 
-        # Get light objects
-        applied = 0
-        skipped = 0
-
-        for entry in data:
-            collection_name = entry.get("collection", "")
-            preset_items = entry.get("preset", [])
-            if not collection_name or not preset_items:
-                continue
-
-            # Find collection
-            collection = bpy.data.collections.get(collection_name)
-            if not collection:
-                self.report({'WARNING'}, f"Collection '{collection_name}' not found; skipping.")
-                skipped += len(preset_items)
-                continue
-
-            # Apply presets to lights in the collection
-            for item in preset_items:
-                light_name = item.get("name", "")
-                if not light_name:
-                    continue
-                light_obj = collection.objects.get(light_name)
-                if not light_obj or light_obj.type != 'LIGHT' or getattr(light_obj, "data", None) is None:
-                    skipped += 1
-                    continue
-
-                # Apply properties
-                light_data = light_obj.data
-                light_data.color = item.get("color", (1.0, 1.0, 1.0))
-                light_data.energy = item.get("energy", 10.0)
-                light_data.exposure = item.get("exposure", 0.0)
-                light_data.shadow_jitter_overblur = item.get("shadow_jitter_overblur", 0.0)
-                applied += 1
+        # Diff against the current values and write only the lights that changed
+        stats = apply_light_preset(table, dry_run=self.dry_run)
 
+        report_preset_stats(self.report, stats, self.dry_run)
         return {'FINISHED'}
 
 def register():
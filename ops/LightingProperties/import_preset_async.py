@@ -0,0 +1,283 @@
+import bpy, threading
+import numpy as np
+from ...utils import handlers
+from ...utils.light_preset import (available_fields, diff_light_columns, diff_light_extras,
+                                   light_rows_for_objects, load_preset_table, read_table_fields,
+                                   resolve_preset_lights, to_python, write_light_extras)
+from .export_import_preset import report_preset_stats
+
+
+# ------------------------------------------------------------------------
+# Import Job
+# ------------------------------------------------------------------------
+class PresetImportJob:
+    """
+    State of one background preset import.
+    Stages: PARSE (worker), then resolve on the main thread, DIFF (worker), APPLY (main, chunked), DONE.
+
+    Chunks are written per light with setattr rather than one foreach_set per field: the viewport
+    stays live between chunks, and a full-column foreach_set over bpy.data.lights would put back
+    snapshot values on lights the user edited meanwhile (and rows shift when lights are added).
+    Undo, redo and file loads replace bpy.data, so the import ends at the first of them.
+    """
+
+    def __init__(self, filepath, chunk_size):
+        self.filepath = filepath
+        self.chunk_size = max(1, chunk_size)
+        self.fields = available_fields()
+        self.stage = 'PARSE'
+        self.error = None
+        self.cancel_requested = False
+        self.invalidated = False  # bpy.data was reloaded; object references are gone
+
+        self.table = None
+        self.rows = None
+        self.objs = []
+        self.light_rows = None
+        self.current = None
+        self.field_changes = {}
+        self.extra_changes = {}  # per-type fields, diffed on the main thread
+        self.pending = []  # resolved row positions still to write
+        self.applied = []  # resolved row positions already written
+        self.stats = {"changed": 0, "unchanged": 0, "skipped": 0, "missing_collections": []}
+
+        self._thread = None
+
+    @property
+    def progress(self) -> float:
+        total = len(self.pending) + len(self.applied)
+        if self.stage == 'DONE':
+            return 1.0
+        if self.stage != 'APPLY' or not total:
+            return 0.0
+        return len(self.applied) / total
+
+    def start_worker(self, target):
+        self._thread = threading.Thread(target=self._run_worker, args=(target,), daemon=True)
+        self._thread.start()
+
+    def worker_busy(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run_worker(self, target):
+        try:
+            target()
+        except Exception as e:
+            self.error = str(e)
+
+    # Worker stages: no bpy access past __init__
+    def parse(self):
+        self.table = load_preset_table(self.filepath, self.fields)
+        if self.table is None:
+            self.error = f"Failed to load preset from {self.filepath}"
+
+    def diff(self):
+        changed, self.field_changes = diff_light_columns(self.table, self.rows, self.light_rows, self.current)
+        if self.extra_changes:
+            changed[list(self.extra_changes)] = True
+        self.pending = np.flatnonzero(changed).tolist()
+        self.stats["changed"] = len(self.pending)
+        self.stats["unchanged"] = len(self.objs) - len(self.pending)
+
+    # Main-thread stages
+    def resolve(self):
+        self.rows, self.objs, skipped, missing = resolve_preset_lights(self.table)
+        self.stats["skipped"] = skipped
+        self.stats["missing_collections"] = missing
+        self.light_rows = light_rows_for_objects(self.objs)
+        self.current = read_table_fields(self.table)
+        self.extra_changes = diff_light_extras(self.table, self.rows, self.objs)
+
+    def apply_chunk(self):
+        """Write the next chunk of changed lights, returning True once everything is written."""
+        chunk, self.pending = self.pending[:self.chunk_size], self.pending[self.chunk_size:]
+        for i in chunk:
+            self._write(i, original=False)
+            self.applied.append(i)
+        return not self.pending
+
+    def rollback(self):
+        """Put back the values of every light written so far."""
+        for i in reversed(self.applied):
+            self._write(i, original=True)
+        self.applied.clear()
+
+    def _write(self, i, original):
+        light = self.objs[i].data
+        kinds = {attr: (size, kind) for attr, size, kind in self.fields}
+        for attr, (diff, desired) in self.field_changes.items():
+            if not diff[i]:
+                continue
+            value = self.current[attr][self.light_rows[i]] if original else desired[i]
+            setattr(light, attr, to_python(value, *kinds[attr]))
+        extras = self.extra_changes.get(i)
+        if extras:
+            write_light_extras(light, {attr: old if original else new for attr, (old, new) in extras.items()})
+
+
+_active_job = None
+
+
+def get_active_import_job():
+    """The running background import, if any (used by the panel for its progress bar)."""
+    return _active_job
+
+
+@handlers.on_reset
+def _on_reset():
+    global _active_job
+    if _active_job is not None:
+        # After undo/redo modal() reports the stop; a file load also frees the modal handler,
+        # so modal() may never run to finish the job
+        print("Lighting preset import stopped: file data was reloaded (undo, redo or file load).")
+        _active_job.invalidated = True
+        _active_job = None
+
+
+# ------------------------------------------------------------------------
+# Lighting Properties - Background Import Preset
+# ------------------------------------------------------------------------
+class ImportLightingPresetAsyncOperator(bpy.types.Operator):
+    """Import lighting settings in the background; the viewport stays usable while lights update"""
+    bl_idname = "blp.import_lighting_preset_async"
+    bl_label = "Import Lighting Preset (Background)"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    # File browser props
+    filepath: bpy.props.StringProperty(subtype='FILE_PATH')
+    filter_glob: bpy.props.StringProperty(
+        default="*.json;*.npz",
+        options={'HIDDEN'}
+    )
+    chunk_size: bpy.props.IntProperty(
+        name="Lights per Step",
+        description="How many changed lights are written per timer step",
+        default=250,
+        min=1,
+    )
+
+    _timer = None
+    _job = None
+
+    @classmethod
+    def poll(cls, context):
+        return _active_job is None
+
+    def invoke(self, context, event):
+        key = getattr(context.scene.lighting_props, "key", "") or "lighting_preset"
+        self.filepath = bpy.path.abspath(f"//{key}.json")
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context):
+        global _active_job
+        if _active_job is not None:
+            self.report({'ERROR'}, "A lighting preset import is already running.")
+            return {'CANCELLED'}
+
+        self._job = _active_job = PresetImportJob(bpy.path.abspath(self.filepath), self.chunk_size)
+        self._job.start_worker(self._job.parse)
+
+        wm = context.window_manager
+        self._timer = wm.event_timer_add(0.05, window=context.window)
+        wm.progress_begin(0, 100)
+        wm.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        job = self._job
+        if job.invalidated:
+            # Undo/redo/load replaced bpy.data; nothing left to roll back
+            return self._finish(context, {'CANCELLED'},
+                                ({'WARNING'}, "Preset import stopped: undo/redo reloaded the file data."))
+        if event.type == 'Z' and (event.ctrl or event.oskey) and event.value == 'PRESS':
+            # Undo would end the import halfway; keep the shortcut from reaching the undo system
+            self.report({'WARNING'}, "Undo is unavailable while a preset import runs; press Esc to cancel it.")
+            return {'RUNNING_MODAL'}
+        if event.type == 'ESC' and event.value == 'PRESS':
+            job.cancel_requested = True
+            return {'RUNNING_MODAL'}
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+
+        if job.cancel_requested:
+            if job.worker_busy():
+                return {'PASS_THROUGH'}
+            job.rollback()
+            return self._finish(context, {'CANCELLED'},
+                                ({'WARNING'}, "Preset import cancelled; written lights restored."))
+        if job.worker_busy():
+            return {'PASS_THROUGH'}
+        if job.error:
+            job.rollback()
+            return self._finish(context, {'CANCELLED'}, ({'ERROR'}, job.error))
+
+        try:
+            if job.stage == 'PARSE':
+                # Parsed; match names and snapshot current values here, diff on the worker
+                job.resolve()
+                job.stage = 'DIFF'
+                job.start_worker(job.diff)
+            elif job.stage == 'DIFF':
+                job.stage = 'APPLY'
+            elif job.stage == 'APPLY':
+                if job.apply_chunk():
+                    job.stage = 'DONE'
+                    report_preset_stats(self.report, job.stats)
+                    return self._finish(context, {'FINISHED'})
+        except Exception as e:
+            try:
+                job.rollback()
+            except Exception as rollback_error:
+                print(f"Preset import rollback failed: {rollback_error}")
+            return self._finish(context, {'CANCELLED'}, ({'ERROR'}, str(e)))
+
+        context.window_manager.progress_update(int(job.progress * 100))
+        _redraw_view3d(context)
+        return {'PASS_THROUGH'}
+
+    def _finish(self, context, result, report=None):
+        global _active_job
+        wm = context.window_manager
+        if self._timer is not None:
+            wm.event_timer_remove(self._timer)
+            self._timer = None
+        wm.progress_end()
+        if report:
+            self.report(*report)
+        if _active_job is self._job:
+            _active_job = None
+        _redraw_view3d(context)
+        return result
+
+
+class BLP_OT_cancel_preset_import(bpy.types.Operator):
+    """Stop the running background preset import and restore the lights it already changed"""
+    bl_idname = "blp.cancel_preset_import"
+    bl_label = "Cancel Preset Import"
+    bl_options = {'INTERNAL'}
+
+    @classmethod
+    def poll(cls, context):
+        return _active_job is not None
+
+    def execute(self, context):
+        _active_job.cancel_requested = True
+        return {'FINISHED'}
+
+
+def _redraw_view3d(context):
+    screen = getattr(context, "screen", None)
+    for area in (screen.areas if screen else []):
+        if area.type == 'VIEW_3D':
+            area.tag_redraw()
+
+
+def register():
+    bpy.utils.register_class(ImportLightingPresetAsyncOperator)
+    bpy.utils.register_class(BLP_OT_cancel_preset_import)
+
+
+def unregister():
+    bpy.utils.unregister_class(BLP_OT_cancel_preset_import)
+    bpy.utils.unregister_class(ImportLightingPresetAsyncOperator)
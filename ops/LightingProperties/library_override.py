@@ -1,4 +1,44 @@
 import bpy
+from ...utils.localize import estimate_id_bytes
+
+
+# ------------------------------------------------------------------------
+# Helpers
+# ------------------------------------------------------------------------
+def plan_light_localization(override_lights, key, per_object=False):
+    """
+    Group override LIGHT objects by the linked Light they use.
+    Returns ([(linked light, [objects], [copy names])], already local count, null data count).
+    Shared mode makes one copy per linked Light (named after its first user);
+    per-object mode makes one copy per object.
+    """
+    by_light = {}  # linked Light pointer -> (light, [objects])
+    already_local = skipped_none = 0
+    for obj in override_lights:
+        L = obj.data
+        if L is None:
+            skipped_none += 1
+            continue
+        if getattr(L, "library", None) is None:
+            already_local += 1
+            continue
+        by_light.setdefault(L.as_pointer(), (L, []))[1].append(obj)
+
+    plan = []
+    for L, objs in by_light.values():
+        users = objs if per_object else objs[:1]
+        plan.append((L, objs, [f"{key}_{o.get(key)}_Light" for o in users]))
+    return plan, already_local, skipped_none
+
+
+def purgeable_linked_lights(plan=None):
+    """
+    Linked Light datablocks with no users, or with none left once 'plan' is applied.
+    With a plan, assumes its objects are the only users about to move to local copies.
+    """
+    moving = {L.as_pointer(): len(objs) for L, objs, _names in (plan or [])}
+    return [L for L in bpy.data.lights
+            if getattr(L, "library", None) is not None and L.users - moving.get(L.as_pointer(), 0) <= 0]
 
 
 # ------------------------------------------------------------------------
@@ -10,6 +50,12 @@ class OBJECT_OT_make_override_lights_local(bpy.types.Operator):
     bl_label = "Make Override Lights Local"
     bl_options = {'REGISTER', 'UNDO'}
 
+    dry_run: bpy.props.BoolProperty(
+        name="Dry Run",
+        description="Only print the copies/purges that would happen and the memory delta",
+        default=False,
+    )
+
     @staticmethod
     def is_override_id(id_):
         # Works in Blender 3.x/4.x: local override IDs have non-None override_library
@@ -25,6 +71,7 @@ class OBJECT_OT_make_override_lights_local(bpy.types.Operator):
         s = context.scene
         props = s.lighting_props
         key = props.key
+        per_object = props.per_object_light_copies
 
         # Collect target objects
         if props.only_selected:
@@ -34,45 +81,65 @@ class OBJECT_OT_make_override_lights_local(bpy.types.Operator):
 
         # Filter to library override objects
         override_lights = [o for o in candidates if self.is_override_id(o)]
-
-        # Select & set active for user feedback (non-destructive)
-        for o in bpy.data.objects:
-            o.select_set(False)
+        plan, already_local_count, skipped_none_count = plan_light_localization(override_lights, key, per_object)
+        copies = sum(len(names) for _L, _objs, names in plan)
+        to_local = sum(len(objs) for _L, objs, _names in plan)
+
+        if self.dry_run:
+            purge = purgeable_linked_lights(plan) if props.purge_unreferenced else []
+            added = sum(estimate_id_bytes(L) * len(names) for L, _objs, names in plan)
+            freed = sum(estimate_id_bytes(L) for L in purge)
+            # Per-object mode would make one copy per user; sharing spends only one
+            shared = sum(estimate_id_bytes(L) * (len(objs) - len(names)) for L, objs, names in plan)
+            print(f"[Dry Run] Make override lights local ({'per-object' if per_object else 'shared'} copies):")
+            for L, objs, names in plan:
+                print(f"  '{L.name}' ({L.library.filepath}) -> {len(objs)} object(s) -> {', '.join(names)}")
+            for L in purge:
+                print(f"  purge linked light '{L.name}'")
+            print(f"  memory delta: ~{(added - freed) / 1024:+.1f} KiB (+{added / 1024:.1f} copied, "
+                  f"-{freed / 1024:.1f} purged, {shared / 1024:.1f} saved by sharing)")
+            self.report({'INFO'},
+                        (f"[Dry Run] Override lights: {len(override_lights)} | Would copy: {copies} for "
+                         f"{to_local} object(s) | Already local: {already_local_count} | "
+                         f"Would purge: {len(purge)} | Memory: ~{(added - freed) / 1024:+.1f} KiB | "
+                         f"See console for the plan"))
+            return {'FINISHED'}
+
+        # Select & set active for user feedback (non-destructive); only touch objects whose state changes
+        targets = set(override_lights)
+        for o in context.selected_objects:
+            if o not in targets:
+                o.select_set(False)
         for o in override_lights:
-            o.select_set(True)
+            if not o.select_get():
+                o.select_set(True)
         if override_lights:
             view_layer.objects.active = override_lights[0]
 
-        made_local_count = 0
-        already_local_count = 0
-        skipped_none_count = 0
-
-        # Make Light datablocks local by copying if they come from a library
-        for obj in override_lights:
-            L = obj.data
-            if L is None:
-                skipped_none_count += 1
-                continue
-            if getattr(L, "library", None) is not None:
-                obj.data = L.copy()
-                obj.data.name = f"{key}_{obj.get(key)}_Light"
-                made_local_count += 1
+        # Make Light datablocks local: one copy per linked Light (or per object), shared by its users
+        for L, objs, names in plan:
+            if per_object:
+                for obj, name in zip(objs, names):
+                    obj.data = L.copy()
+                    obj.data.name = name
             else:
-                already_local_count += 1
+                local_light = L.copy()
+                local_light.name = names[0]
+                for obj in objs:
+                    obj.data = local_light
 
         purged_count = 0
         if props.purge_unreferenced:
-            # Remove linked Light datablocks with zero users
-            # Use list(...) to avoid modifying while iterating
-            for L in list(bpy.data.lights):
-                if getattr(L, "library", None) is not None and L.users == 0:
-                    bpy.data.lights.remove(L)
-                    purged_count += 1
+            # Remove linked Light datablocks with zero users in one call
+            purge = purgeable_linked_lights()
+            if purge:
+                bpy.data.batch_remove(purge)
+            purged_count = len(purge)
 
         self.report(
             {'INFO'},
             (f"Processed {len(override_lights)} override LIGHT objects | "
-             f"Made local: {made_local_count} | Already local: {already_local_count} | "
+             f"Made local: {to_local} (copies: {copies}) | Already local: {already_local_count} | "
              f"Null data: {skipped_none_count} | Purged linked lights: {purged_count}")
         )
         return {'FINISHED'}
@@ -86,4 +153,4 @@ def register():
 
 
 def unregister():
-    bpy.utils.unregister_class(OBJECT_OT_make_override_lights_local)
\ No newline at end of file
+    bpy.utils.unregister_class(OBJECT_OT_make_override_lights_local)
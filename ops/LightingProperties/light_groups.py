@@ -0,0 +1,45 @@
+import bpy
+from ...utils.light_index import get_keyed_index, get_expanded_groups, set_expanded_groups
+
+
+# ------------------------------------------------------------------------
+# Lighting Properties - Toggle Light Group
+# ------------------------------------------------------------------------
+class BLP_OT_toggle_light_group(bpy.types.Operator):
+    """Expand or collapse a light group in the Lighting Properties panel"""
+    bl_idname = "blp.toggle_light_group"
+    bl_label = "Toggle Light Group"
+    bl_options = {'INTERNAL'}
+
+    suffix: bpy.props.StringProperty(
+        name="Suffix",
+        description="Group to toggle",
+        default="",
+    )
+    toggle_all: bpy.props.BoolProperty(
+        name="Toggle All",
+        description="Expand every group, or collapse them all if any is expanded",
+        default=False,
+    )
+
+    def execute(self, context):
+        props = context.scene.lighting_props
+        expanded = get_expanded_groups(props)
+
+        if not self.toggle_all:
+            expanded ^= {self.suffix}
+        elif expanded:
+            expanded = set()
+        else:
+            expanded = {suffix for suffix, _rows in get_keyed_index(context.scene, props.key).groups()}
+
+        set_expanded_groups(props, expanded)
+        return {'FINISHED'}
+
+
+def register():
+    bpy.utils.register_class(BLP_OT_toggle_light_group)
+
+
+def unregister():
+    bpy.utils.unregister_class(BLP_OT_toggle_light_group)
@@ -0,0 +1,201 @@
+import bpy
+from fnmatch import fnmatchcase
+from ...utils.hierarchy_index import HierarchyIndex
+from ...utils.instancer_index import base_name, invalidate as invalidate_instancers
+from ...utils.localize import Localizer
+from ...utils.override_index import OverrideIndex
+from .override_fog_materials import (ensure_collection_override_hierarchy, ensure_instance_collection_overrides,
+                                     find_instanced_collections_with_object, is_linked, is_override,
+                                     make_meshes_local_in_hierarchy, make_override_from_instancer,
+                                     pick_rootmost_linked_collection, unlink_linked_original)
+
+
+# ------------------------------------------------------------------------
+# Helpers
+# ------------------------------------------------------------------------
+def parse_name_list(text: str):
+    """'Fog, Rock_A;Tree' -> {'Fog', 'Rock_A', 'Tree'}"""
+    return {n.strip() for n in text.replace(";", ",").split(",") if n.strip()}
+
+
+def match_targets(hierarchy, names=(), pattern=""):
+    """
+    Objects under the indexed tree whose name or base name is in 'names',
+    or whose base name matches the glob 'pattern'. One pass over the indexed objects.
+    """
+    targets = []
+    for obj in hierarchy.objects:
+        base = base_name(obj.name)
+        if obj.name in names or base in names or (pattern and fnmatchcase(base, pattern)):
+            targets.append(obj)
+    return targets
+
+
+def group_targets_by_root(targets, hierarchy, scene_root):
+    """
+    Group targets by their rootmost linked collection: {root: [targets]}.
+    Targets with no linked ancestor are returned under None (nothing to override).
+    """
+    groups = {}
+    for obj in targets:
+        root = pick_rootmost_linked_collection(hierarchy.collections_with(obj), scene_root, hierarchy)
+        if root is not None and not is_linked(root):
+            root = None
+        groups.setdefault(root, []).append(obj)
+    return groups
+
+
+def localize_target_materials(obj, localizer, localize_groups=True):
+    """
+    Localize the materials on obj's mesh. Slots on linked or overridden mesh data cannot be
+    reassigned, so when any slot needs a local copy the object first gets its own mesh.
+    """
+    data = getattr(obj, "data", None)
+    mats = getattr(data, "materials", None) if data else None
+    if mats and (is_linked(data) or is_override(data)) and any(m and is_linked(m) for m in mats):
+        if not localizer.localize_object_data(obj):
+            obj.data = data.copy()
+    return localizer.localize_materials_on_object(obj, localize_groups)
+
+
+def override_from_instancer(name: str):
+    """
+    Fallback for targets that only exist inside a collection instance: override the first
+    instancer holding 'name' and return the new object (exact or base-name match), or None.
+    """
+    candidates = list(find_instanced_collections_with_object(name))
+    if not candidates:
+        return None
+    make_override_from_instancer(candidates[0][0])
+    obj = bpy.data.objects.get(name)
+    if obj is None or is_linked(obj):
+        obj = next((o for o in bpy.data.objects
+                    if not is_linked(o) and base_name(o.name) == name), None)
+    return obj
+
+
+# ------------------------------------------------------------------------
+# Operator: Batch Override Materials
+# ------------------------------------------------------------------------
+class BLP_OT_override_materials_batch(bpy.types.Operator):
+    """Override the linked hierarchies of several objects at once and localize their materials"""
+    bl_idname = "blp.override_materials_batch"
+    bl_label = "Batch Override Materials"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    object_names: bpy.props.StringProperty(
+        name="Object Names",
+        description="Comma-separated target object names (the .### suffix is ignored)",
+        default="Fog",
+    )
+    name_pattern: bpy.props.StringProperty(
+        name="Name Pattern",
+        description="Optional glob matched against object base names, e.g. 'Rock_*'",
+        default="",
+    )
+    localize_groups: bpy.props.BoolProperty(
+        name="Localize Node Groups",
+        description="Also duplicate linked node-groups used by the materials",
+        default=True,
+    )
+    make_geometry_local: bpy.props.BoolProperty(
+        name="Make Geometry Local",
+        description="Make mesh data local for every mesh under the overridden hierarchies",
+        default=True,
+    )
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+
+    def execute(self, context):
+        scene = context.scene
+        view_layer = context.view_layer
+        names = parse_name_list(self.object_names)
+        pattern = self.name_pattern.strip()
+        if not names and not pattern:
+            self.report({'ERROR'}, "Give at least one object name or a name pattern.")
+            return {'CANCELLED'}
+
+        # One hierarchy pass finds every target and its rootmost linked collection
+        hierarchy = HierarchyIndex([scene.collection])
+        targets = match_targets(hierarchy, names, pattern)
+        found = {base_name(o.name) for o in targets} | {o.name for o in targets}
+        not_found = sorted(names - found)
+        if not targets and not not_found:
+            self.report({'ERROR'}, "No objects under the scene match the given names or pattern.")
+            return {'CANCELLED'}
+
+        groups = group_targets_by_root(targets, hierarchy, scene.collection)
+
+        # Override each root hierarchy once, sharing the override index and copy memo across roots
+        index = OverrideIndex()
+        localizer = Localizer()
+        overridden = []
+        for root_col in groups:
+            if root_col is None:
+                continue
+            print(f"Ensuring override hierarchy for '{root_col.name}' ({len(groups[root_col])} target(s))...")
+            root_override = ensure_collection_override_hierarchy(root_col, scene, view_layer, index)
+            if not root_override:
+                self.report({'WARNING'}, f"Could not override '{root_col.name}'.")
+                continue
+            ensure_instance_collection_overrides(root_override, scene, view_layer, index)
+            if self.make_geometry_local:
+                make_meshes_local_in_hierarchy(root_override, localizer)
+            overridden.append(root_col)
+
+        # The override pass linked new collections into the scene; one rebuild serves every unlink
+        if overridden:
+            hierarchy.rebuild()
+            for root_col in overridden:
+                unlink_linked_original(scene, root_col, hierarchy)
+
+        # Localize materials on the override of each target (or the target itself when it is local)
+        slots = 0
+        failed = []
+        for obj in targets:
+            target = index.get(obj) if is_linked(obj) else obj
+            if target is None:
+                self.report({'WARNING'}, f"No override was created for '{obj.name}'.")
+                continue
+            try:
+                slots += localize_target_materials(target, localizer, self.localize_groups)
+            except Exception as e:
+                failed.append(target.name)
+                print(f"Could not localize materials on '{target.name}': {e}")
+
+        # Names not under the scene tree may still sit inside a collection instance
+        if not_found:
+            # The override pass above created objects this run; don't trust the cached index
+            invalidate_instancers()
+            missing = []
+            for name in not_found:
+                try:
+                    target = override_from_instancer(name)
+                    if target is None:
+                        missing.append(name)
+                        continue
+                    slots += localize_target_materials(target, localizer, self.localize_groups)
+                except Exception as e:
+                    failed.append(name)
+                    print(f"Could not override '{name}' from its collection instance: {e}")
+            not_found = missing
+
+        if failed:
+            self.report({'WARNING'}, f"Could not localize materials on: {', '.join(failed)}")
+        if not_found:
+            self.report({'WARNING'}, f"Not found under the scene: {', '.join(not_found)}")
+        self.report({'INFO'}, (f"Targets: {len(targets)} | Hierarchies overridden: {len(overridden)} | "
+                               f"Material slots localized: {slots} | {localizer.summary()}"))
+        return {'FINISHED'}
+
+
+# ------------------------------------------------------------------------
+# Register
+# ------------------------------------------------------------------------
+def register():
+    bpy.utils.register_class(BLP_OT_override_materials_batch)
+
+
+def unregister():
+    bpy.utils.unregister_class(BLP_OT_override_materials_batch)
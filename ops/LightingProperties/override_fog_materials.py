@@ -1,5 +1,9 @@
 import bpy
 from collections import deque
+from ...utils.hierarchy_index import HierarchyIndex
+from ...utils.instancer_index import find_instancers, invalidate as invalidate_instancers
+from ...utils.localize import Localizer
+from ...utils.override_index import OverrideIndex
 
 
 # ------------------------------------------------------------------------
@@ -7,17 +11,8 @@ from collections import deque
 # ------------------------------------------------------------------------
 def find_instanced_collections_with_object(target_name: str):
     """Yield (instancer_empty, instanced_collection) where collection contains target object by name."""
-    for obj in bpy.data.objects:
-        if obj.type == 'EMPTY' and getattr(obj, "instance_type", None) == 'COLLECTION':
-            coll = getattr(obj, "instance_collection", None)
-            if not coll:
-                continue
-            # coll.all_objects includes nested children if available
-            objs = getattr(coll, "all_objects", coll.objects)
-            for o in objs:
-                if o and (o.name == target_name or o.name.split(".", 1)[0] == target_name):
-                    yield (obj, coll)
-                    break
+    # Served by the shared name -> instancer index instead of walking every instancer's objects
+    yield from find_instancers(target_name)
 
 
 def make_override_from_instancer(instancer_obj):
@@ -34,37 +29,19 @@ def make_override_from_instancer(instancer_obj):
     return True
 
 
-def localize_linked_node_groups(material):
-    """If material uses linked node groups, copy them to local so edits stick."""
+def localize_linked_node_groups(material, localizer=None):
+    """If material uses linked node groups (at any nesting depth), point it at shared local copies."""
     if not material or not material.use_nodes or not material.node_tree:
         return
-    for node in material.node_tree.nodes:
-        if node.type == 'GROUP' and node.node_tree and node.node_tree.library:
-            node.node_tree = node.node_tree.copy()
+    (localizer or Localizer()).localize_node_tree(material.node_tree)
 
 
-def localize_materials_on_object(obj, localize_groups=True):
-    """Replace linked materials on obj.data.materials with local copies. Returns count."""
-    data = getattr(obj, "data", None)
-    mats = getattr(data, "materials", None) if data else None
-    if not mats:
-        return 0
-    changed = 0
-    for i, mat in enumerate(list(mats)):
-        if mat is None:
-            continue
-        # Already local/overridden? Keep; optionally localize inner node groups.
-        if (mat.library is None) or getattr(mat, "override_library", None):
-            if localize_groups:
-                localize_linked_node_groups(mat)
-            continue
-        # Make local copy (name may auto-unique if a clash exists).
-        local_mat = mat.copy()
-        mats[i] = local_mat
-        if localize_groups:
-            localize_linked_node_groups(local_mat)
-        changed += 1
-    return changed
+def localize_materials_on_object(obj, localize_groups=True, localizer=None):
+    """
+    Replace linked materials on obj.data.materials with local copies. Returns count.
+    Pass one Localizer per run so every slot/object sharing a linked ID gets the same copy.
+    """
+    return (localizer or Localizer()).localize_materials_on_object(obj, localize_groups)
 
 
 def is_override(idblock):
@@ -75,28 +52,12 @@ def is_linked(idblock):
     return getattr(idblock, "library", None) is not None
 
 
-def find_override_for_reference(idblock):
+def find_override_for_reference(idblock, index):
     """Return the override that points to 'idblock' as its reference, if any."""
-    if idblock is None:
-        return None
-
-    pools = []
-    if isinstance(idblock, bpy.types.Collection):
-        pools.append(bpy.data.collections)
-    elif isinstance(idblock, bpy.types.Object):
-        pools.append(bpy.data.objects)
-    else:
-        pools = [bpy.data.collections, bpy.data.objects]
-
-    for pool in pools:
-        for candidate in pool:
-            ol = getattr(candidate, "override_library", None)
-            if ol and ol.reference == idblock:
-                return candidate
-    return None
+    return index.get(idblock)
 
 
-def ensure_collection_override_hierarchy(col, scene, view_layer):
+def ensure_collection_override_hierarchy(col, scene, view_layer, index):
     """Create or fetch an override for a collection as a hierarchy root."""
     if col is None:
         return None
@@ -105,11 +66,14 @@ def ensure_collection_override_hierarchy(col, scene, view_layer):
     if not is_linked(col):
         return col
 
-    ov = find_override_for_reference(col)
+    ov = find_override_for_reference(col, index)
     if ov:
         return ov
 
     ov = col.override_hierarchy_create(scene=scene, view_layer=view_layer)
+    if ov:
+        # Keep the index current so later lookups see the whole new hierarchy
+        index.add_hierarchy(ov)
     return ov
 
 
@@ -128,9 +92,10 @@ def iter_objects_recursive(col):
         yield from iter_objects_recursive(child)
 
 
-def ensure_instance_collection_overrides(root_override, scene, view_layer):
+def ensure_instance_collection_overrides(root_override, scene, view_layer, index):
     """
     Follow object->instance_collection links and ensure those collections are overridden too.
+    All reference->override lookups go through 'index' (an OverrideIndex).
     """
     if not root_override:
         return
@@ -147,8 +112,8 @@ def ensure_instance_collection_overrides(root_override, scene, view_layer):
         for obj in col.objects:
             if getattr(obj, "instance_type", None) == 'COLLECTION' and obj.instance_collection:
                 inst_col = obj.instance_collection
-                if is_linked(inst_col) or find_override_for_reference(inst_col):
-                    ov_inst = ensure_collection_override_hierarchy(inst_col, scene, view_layer)
+                if is_linked(inst_col) or find_override_for_reference(inst_col, index):
+                    ov_inst = ensure_collection_override_hierarchy(inst_col, scene, view_layer, index)
                     if ov_inst and obj.instance_collection != ov_inst:
                         try:
                             obj.instance_collection = ov_inst
@@ -161,35 +126,34 @@ def ensure_instance_collection_overrides(root_override, scene, view_layer):
             queue.append(child)
 
 
-def make_meshes_local_in_hierarchy(root_col):
-    """Make mesh datablocks local for all mesh objects under root_col."""
+def make_meshes_local_in_hierarchy(root_col, localizer=None):
+    """
+    Make mesh datablocks local for all mesh objects under root_col. Returns objects remapped.
+    Each object is visited once, and each linked mesh is copied once and shared by all its users.
+    """
     if not root_col:
-        return
-    for obj in iter_objects_recursive(root_col):
+        return 0
+    localizer = localizer or Localizer()
+    remapped = 0
+    # The index visits every collection once, so objects linked in several collections appear once
+    for obj in HierarchyIndex([root_col]).objects:
         if obj.type == 'MESH' and obj.data and is_linked(obj.data):
-            obj.data = obj.data.copy()
+            remapped += localizer.localize_object_data(obj)
+    print(f"Localized meshes on {remapped} object(s) | {localizer.summary()}")
+    return remapped
 
 
-def _find_holder(root, child):
-    """Return the direct parent collection of 'child' under 'root' (DFS)."""
-    for c in root.children:
-        if c == child:
-            return root
-        h = _find_holder(c, child)
-        if h:
-            return h
-    return None
+def _find_holder(root, child, index=None):
+    """Return the direct parent collection of 'child' under 'root'."""
+    index = index or HierarchyIndex([root])
+    return index.holder(child)
 
 
-def _path_to_collection(root_col, target):
+def _path_to_collection(root_col, target, index=None):
     """Return the ancestry path [root_col ... target] or [] if not found."""
-    if root_col == target:
-        return [root_col]
-    for c in root_col.children:
-        path = _path_to_collection(c, target)
-        if path:
-            return [root_col] + path
-    return []
+    index = index or HierarchyIndex([root_col])
+    path = index.path(target)
+    return path if path and path[0] == root_col else []
 
 
 # ========================================
@@ -197,7 +161,7 @@ def _path_to_collection(root_col, target):
 # (adapted from your helper, minimal edits)
 # ========================================
 
-def get_collections_containing_object_in_scene(obj_name, scene=None):
+def get_collections_containing_object_in_scene(obj_name, scene=None, index=None):
     """Return all collections (under scene root) that directly contain the object."""
     obj = bpy.data.objects.get(obj_name)
     if not obj:
@@ -207,19 +171,11 @@ def get_collections_containing_object_in_scene(obj_name, scene=None):
     if scene is None:
         scene = bpy.context.scene
 
-    collections = []
-
-    def _search(col):
-        if obj.name in col.objects:
-            collections.append(col)
-        for child in col.children:
-            _search(child)
-
-    _search(scene.collection)
-    return collections
+    index = index or HierarchyIndex([scene.collection])
+    return index.collections_with(obj)
 
 
-def pick_rootmost_linked_collection(candidates, scene_root):
+def pick_rootmost_linked_collection(candidates, scene_root, index=None):
     """
     From a set of collections that contain the object, pick the highest (closest to scene root)
     *linked* ancestor that actually contains that candidate in its subtree.
@@ -229,9 +185,10 @@ def pick_rootmost_linked_collection(candidates, scene_root):
         return None
 
     # For each candidate, compute its path to the scene root
+    index = index or HierarchyIndex([scene_root])
     paths = []
     for col in candidates:
-        path = _path_to_collection(scene_root, col)
+        path = _path_to_collection(scene_root, col, index)
         if path:
             paths.append(path)
 
@@ -253,6 +210,27 @@ def pick_rootmost_linked_collection(candidates, scene_root):
     return paths[0][0] if len(paths[0]) > 1 else paths[0][-1]
 
 
+def unlink_linked_original(scene, root_col, hierarchy):
+    """Unlink the linked original of an overridden root so the scene tree holds no duplicate."""
+    holder = _find_holder(scene.collection, root_col, hierarchy)
+    if holder:
+        try:
+            holder.children.unlink(root_col)
+            print(f"Unlinked linked original '{root_col.name}' from '{holder.name}'")
+        except RuntimeError as e:
+            # Fallback: try scene root if the holder is itself linked or context-bound
+            try:
+                if root_col.name in scene.collection.children.keys():
+                    scene.collection.children.unlink(root_col)
+                    print(f"Forced unlink at scene root for '{root_col.name}'")
+                else:
+                    print(f"Could not unlink linked original '{root_col.name}': {e}")
+            except Exception as e2:
+                print(f"Second-chance unlink failed for '{root_col.name}': {e2}")
+    else:
+        print(f"Linked original '{root_col.name}' not found under scene; nothing to unlink")
+
+
 # ------------------------------------------------------------------------
 # Operator: Override 'Fog' Materials
 # ------------------------------------------------------------------------
@@ -278,53 +256,42 @@ class BLP_OT_override_fog_materials(bpy.types.Operator):
         scene = bpy.context.scene
         view_layer = bpy.context.view_layer
         MAKE_GEOMETRY_LOCAL = True  # your original toggle
+        localizer = Localizer()  # one copy per linked mesh/material/node group for the whole run
 
         # 1) Locate collections that contain the target object under the *scene* tree
-        cand_cols = get_collections_containing_object_in_scene(target, scene=scene)
+        #    One hierarchy pass answers the containment, path and holder queries below
+        hierarchy = HierarchyIndex([scene.collection])
+        cand_cols = get_collections_containing_object_in_scene(target, scene=scene, index=hierarchy)
 
         if not cand_cols:
             raise RuntimeError(f"No collections under the scene contain object '{target}'.")
 
         # 2) Choose the root-most (near scene root) *linked* collection to treat as the hierarchy root.
-        root_col = pick_rootmost_linked_collection(cand_cols, scene.collection)
+        root_col = pick_rootmost_linked_collection(cand_cols, scene.collection, hierarchy)
         if not root_col:
             # As a fallback, try the first candidate
             root_col = cand_cols[0]
 
         print(f"Selected hierarchy root collection: '{root_col.name}'")
 
-        # 3) Ensure override for that root
+        # 3) Ensure override for that root; one reference->override index serves the whole run
         print(f"Ensuring override hierarchy for '{root_col.name}'...")
-        root_override = ensure_collection_override_hierarchy(root_col, scene, view_layer)
+        index = OverrideIndex()
+        root_override = ensure_collection_override_hierarchy(root_col, scene, view_layer, index)
 
         # 4) Follow child + instanced collections to ensure overrides exist
         print("Following hierarchy (children + instanced collections) and ensuring overrides...")
-        ensure_instance_collection_overrides(root_override, scene, view_layer)
+        ensure_instance_collection_overrides(root_override, scene, view_layer, index)
 
         # 5) Optional: make geometries local while keeping objects/collections overridden
         if MAKE_GEOMETRY_LOCAL:
             print("Making mesh data local for all Mesh objects under the overridden hierarchy...")
-            make_meshes_local_in_hierarchy(root_override)
+            make_meshes_local_in_hierarchy(root_override, localizer)
 
         # 6) Unlink the linked original holder to avoid duplicates in the scene tree
         #    (kept your original pattern, fixed minor variable typo)
-        holder = _find_holder(scene.collection, root_col)
-        if holder:
-            try:
-                holder.children.unlink(root_col)
-                print(f"Unlinked linked original '{root_col.name}' from '{holder.name}'")
-            except RuntimeError as e:
-                # Fallback: try scene root if the holder is itself linked or context-bound
-                try:
-                    if root_col.name in scene.collection.children.keys():
-                        scene.collection.children.unlink(root_col)
-                        print(f"Forced unlink at scene root for '{root_col.name}'")
-                    else:
-                        print(f"Could not unlink linked original '{root_col.name}': {e}")
-                except Exception as e2:
-                    print(f"Second-chance unlink failed for '{root_col.name}': {e2}")
-        else:
-            print(f"Linked original '{root_col.name}' not found under scene; nothing to unlink")
+        #    The override pass linked new collections into the scene, so refresh the snapshot first
+        unlink_linked_original(scene, root_col, hierarchy.rebuild())
 
         print(f"Done. Root override: '{root_override.name if root_override else 'None'}'")
 
@@ -335,7 +302,7 @@ class BLP_OT_override_fog_materials(bpy.types.Operator):
         obj = bpy.data.objects.get(target)
         if obj and obj.type == 'MESH' and obj.data and is_linked(obj.data):
             try:
-                obj.data = obj.data.copy()
+                localizer.localize_object_data(obj)
                 print(f"Made mesh data local for '{obj.name}'.")
             except Exception as e:
                 print(f"Could not localize mesh data for '{obj.name}': {e}")
@@ -343,6 +310,8 @@ class BLP_OT_override_fog_materials(bpy.types.Operator):
         # If Fog already exists (e.g., already overridden), skip the collection search.
         fog = bpy.data.objects.get(target)
         if not fog:
+            # The override pass above created objects this run; don't trust the cached index
+            invalidate_instancers()
             candidates = list(find_instanced_collections_with_object(target))
             if not candidates:
                 self.report({'ERROR'}, f"No collection instance in the scene appears to contain '{target}'.")
@@ -365,8 +334,9 @@ class BLP_OT_override_fog_materials(bpy.types.Operator):
                     return {'CANCELLED'}
 
         # Localize Fog's materials (no renaming)
-        changed = localize_materials_on_object(fog, self.localize_groups)
-        self.report({'INFO'}, f"Parent collection overridden. Localized {changed} material(s) on '{fog.name}'.")
+        changed = localize_materials_on_object(fog, self.localize_groups, localizer)
+        self.report({'INFO'}, (f"Parent collection overridden. Localized {changed} material slot(s) on "
+                               f"'{fog.name}' | {localizer.summary()}"))
         return {'FINISHED'}
 
 
@@ -0,0 +1,180 @@
+import bpy, os, time
+from ...utils.light_index import find_objects_by_key
+from ...utils.light_preset import LightPresetTable, apply_light_preset
+from ...utils.preset_store import PresetStore
+from .export_import_preset import report_preset_stats
+
+SNAPSHOT_DIR = "//lighting_presets/history"
+
+# Blender requires dynamic enum strings to stay referenced while the enum is shown; the items are
+# also cached, keyed by (snapshot dir, its mtime), so redraws do not re-read every manifest
+_NO_SNAPSHOTS = [("", "<no snapshots>", "")]
+_snapshot_items = _NO_SNAPSHOTS
+_snapshot_items_key = None
+
+
+# ------------------------------------------------------------------------
+# Helpers
+# ------------------------------------------------------------------------
+def get_preset_store():
+    """Return the snapshot store next to the saved blend file, or None if it is unsaved."""
+    if not bpy.data.filepath:
+        return None
+    return PresetStore(bpy.path.abspath(SNAPSHOT_DIR))
+
+
+def invalidate_snapshot_items():
+    """Re-read the manifests on the next enum request (after saving or deleting a snapshot)."""
+    global _snapshot_items_key
+    _snapshot_items_key = None
+
+
+def _enum_snapshots(self, context):
+    global _snapshot_items, _snapshot_items_key
+    store = get_preset_store()
+    if store is None:
+        return _NO_SNAPSHOTS
+    try:
+        mtime = os.stat(store.snapshot_dir).st_mtime_ns
+    except OSError:
+        mtime = None
+    key = (str(store.snapshot_dir), mtime)
+    if key == _snapshot_items_key:
+        return _snapshot_items
+
+    items = []
+    for m in (store.list_snapshots() if mtime is not None else []):
+        snapshot_id = m.get("id")
+        created = time.strftime("%Y-%m-%d %H:%M", time.localtime(m.get("created", 0)))
+        label = f"{created}  {m.get('label') or ''}".rstrip()
+        desc = f"{m.get('lights', 0)} light(s) in {len(m.get('collections', {}))} collection(s)"
+        items.append((snapshot_id, label, desc))
+    _snapshot_items = items or _NO_SNAPSHOTS
+    _snapshot_items_key = key
+    return _snapshot_items
+
+
+# ------------------------------------------------------------------------
+# Lighting Properties - Preset Snapshots
+# ------------------------------------------------------------------------
+class BLP_OT_save_lighting_snapshot(bpy.types.Operator):
+    """Save the current light settings to the preset history next to the blend file"""
+    bl_idname = "blp.save_lighting_snapshot"
+    bl_label = "Save Lighting Snapshot"
+    bl_options = {'REGISTER'}
+
+    label: bpy.props.StringProperty(
+        name="Label",
+        description="Optional note shown in the snapshot list",
+        default="",
+    )
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+
+    def execute(self, context):
+        store = get_preset_store()
+        if store is None:
+            self.report({'ERROR'}, "Save the blend file first; snapshots live next to it.")
+            return {'CANCELLED'}
+
+        key = context.scene.lighting_props.key
+        lights = [o for o in find_objects_by_key(key, scene=context.scene)
+                  if o.type == 'LIGHT' and getattr(o, "data", None)]
+        table = LightPresetTable.from_objects(lights)
+
+        manifest, written, reused = store.save_snapshot(table, label=self.label)
+        invalidate_snapshot_items()
+        self.report({'INFO'},
+                    (f"Saved snapshot '{manifest['id']}' | Lights: {len(table)} | "
+                     f"New blocks: {written} | Reused blocks: {reused}"))
+        return {'FINISHED'}
+
+
+class BLP_OT_restore_lighting_snapshot(bpy.types.Operator):
+    """Restore light settings from a snapshot in the preset history"""
+    bl_idname = "blp.restore_lighting_snapshot"
+    bl_label = "Restore Lighting Snapshot"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    snapshot: bpy.props.EnumProperty(
+        name="Snapshot",
+        items=_enum_snapshots,
+        description="Snapshot to restore",
+    )
+    dry_run: bpy.props.BoolProperty(
+        name="Dry Run",
+        description="Only report how many lights would change, without writing anything",
+        default=False,
+    )
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+
+    def execute(self, context):
+        store = get_preset_store()
+        if store is None:
+            self.report({'ERROR'}, "Save the blend file first; snapshots live next to it.")
+            return {'CANCELLED'}
+        if not self.snapshot:
+            self.report({'ERROR'}, "No snapshot selected.")
+            return {'CANCELLED'}
+
+        try:
+            table = store.load_snapshot(self.snapshot)
+        except Exception as e:
+            self.report({'ERROR'}, f"Failed to load snapshot '{self.snapshot}': {e}")
+            return {'CANCELLED'}
+
+        stats = apply_light_preset(table, dry_run=self.dry_run)
+        report_preset_stats(self.report, stats, self.dry_run)
+        return {'FINISHED'}
+
+
+class BLP_OT_delete_lighting_snapshot(bpy.types.Operator):
+    """Remove a snapshot from the preset history"""
+    bl_idname = "blp.delete_lighting_snapshot"
+    bl_label = "Delete Lighting Snapshot"
+    bl_options = {'REGISTER'}
+
+    snapshot: bpy.props.EnumProperty(
+        name="Snapshot",
+        items=_enum_snapshots,
+        description="Snapshot to delete",
+    )
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+
+    def execute(self, context):
+        store = get_preset_store()
+        if store is None:
+            self.report({'ERROR'}, "Save the blend file first; snapshots live next to it.")
+            return {'CANCELLED'}
+        if not self.snapshot:
+            self.report({'ERROR'}, "No snapshot selected.")
+            return {'CANCELLED'}
+
+        try:
+            deleted = store.delete_snapshot(self.snapshot)
+        except OSError as e:
+            self.report({'ERROR'}, f"Failed to delete snapshot '{self.snapshot}': {e}")
+            return {'CANCELLED'}
+        invalidate_snapshot_items()
+        if not deleted:
+            self.report({'WARNING'}, f"Snapshot '{self.snapshot}' no longer exists.")
+            return {'CANCELLED'}
+        self.report({'INFO'}, f"Deleted snapshot '{self.snapshot}'.")
+        return {'FINISHED'}
+
+
+def register():
+    bpy.utils.register_class(BLP_OT_save_lighting_snapshot)
+    bpy.utils.register_class(BLP_OT_restore_lighting_snapshot)
+    bpy.utils.register_class(BLP_OT_delete_lighting_snapshot)
+
+
+def unregister():
+    bpy.utils.unregister_class(BLP_OT_delete_lighting_snapshot)
+    bpy.utils.unregister_class(BLP_OT_restore_lighting_snapshot)
+    bpy.utils.unregister_class(BLP_OT_save_lighting_snapshot)
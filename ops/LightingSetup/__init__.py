@@ -1,8 +1,9 @@
-from . import append_blend, set_child_of_bone_popup
+from . import append_blend, batch_setup, set_child_of_bone_popup
 
 modules = [
     set_child_of_bone_popup,
     append_blend,
+    batch_setup,
 ]
 
 
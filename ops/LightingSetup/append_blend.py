@@ -1,6 +1,10 @@
-import bpy, re, mathutils
+import bpy, itertools, mathutils
+from ...utils import handlers
+from ...utils.batch_rename import SuffixRule, local_names, plan_renames
 from ...utils.file_manager import FileManager
-from .set_child_of_bone_popup import CUSTOM_BONE_NAME
+from ...utils.id_journal import IDJournal
+from ...utils.rig_index import get_rig_index
+from ...utils.template_cache import instantiate_override, instantiate_template
 
 
 # ------------------------------------------------------------------------
@@ -30,99 +34,31 @@ def unique_collection_name(base: str, reporter=None) -> str | None:
     return None
 
 
-# Insert _<suffix> before any numeric .### tail.
-def object_name_with_suffix(name: str, suffix: str) -> str:
+def add_suffix_to_objects_in_collection(coll: bpy.types.Collection, suffix: str, key, reporter=None) -> int:
     """
-    Insert _<suffix> before any numeric .### tail.
-    If already suffixed with _<suffix>, return unchanged.
-    """
-    wanted_tail = f"_{suffix}"
-    if name.endswith(wanted_tail) or re.search(rf"_{re.escape(suffix)}\.\d{{3}}$", name):
-        return name  # already has suffix (with or without numeric tail)
-
-    m = re.match(r"^(.*?)(\.\d{3})$", name)
-    if m:
-        core, num = m.groups()
-        return f"{core}{wanted_tail}{num}"
-    return f"{name}{wanted_tail}"
-
-
-def unique_object_name(desired: str, reporter=None) -> str:
-    """
-    Return desired if it's available.
-    If an object with that name already exists, return None and optionally warn.
-    """
-    if bpy.data.objects.get(desired) is None:
-        return desired
-
-    # desired name already taken → stop and warn
-    if reporter:
-        reporter({'WARNING'}, f"Object '{desired}' already exists. Aborting to avoid conflict.")
-    return None
-
-
-def add_suffix_to_objects_in_collection(coll: bpy.types.Collection, suffix: str, key) -> int:
-    """
-    Rename all objects inside `coll` (recursively) by appending _<suffix>.
+    Rename all objects inside `coll` (recursively) by inserting _<suffix> before any numeric .### tail,
+    and store each new name in the `key` custom property. Target names are planned up front against
+    the names already in the file; a taken name gets the next free .### tail instead of being skipped.
     Returns the count of objects renamed.
     """
-    renamed = 0
     # coll.all_objects includes objects from nested child collections
     objs = getattr(coll, "all_objects", coll.objects)
-    for obj in objs:
-        old = obj.name
-        wanted = object_name_with_suffix(old, suffix)
-        if wanted != old:
-            new_name = unique_object_name(wanted)
-            try:
-                obj.name = new_name
-                obj[key] = obj.name
-                renamed += 1
-            except Exception:
-                # Silently skip if renaming is blocked by some operator context
-                pass
-    return renamed
+    plan = plan_renames(objs, SuffixRule(suffix), local_names(bpy.data.objects))
+    if reporter:
+        for old, wanted in plan.collided:
+            reporter({'WARNING'}, f"Object '{wanted}' already exists; '{old}' gets a numbered name instead.")
+    return len(plan.apply(key))
 
 
 # Detect rig in collection
-def _all_objects_in_collection(coll: bpy.types.Collection):
-    """Return all objects in `coll`, including from nested child collections."""
-    return getattr(coll, "all_objects", coll.objects)
-
-
-def _score_rig_candidate(obj: bpy.types.Object) -> int:
-    """
-    Rank likely rigs:
-      +2 if name contains 'rig'
-      +1 if it has pose bones (i.e. at least one bone)
-      +1 if it has any custom properties (often true for rig controllers)
-    Higher is better.
-    """
-    score = 0
-    name_l = obj.name.lower()
-    if "rig" in name_l or name_l.startswith("rg") or name_l.endswith("_rig"):
-        score += 2
-    if obj.type == 'ARMATURE' and obj.data and len(getattr(obj.data, "bones", [])) > 0:
-        score += 1
-    if len(obj.keys()) > 0:  # custom props on object
-        score += 1
-    return score
-
-
 def find_rigs_in_collection(coll: bpy.types.Collection) -> list[bpy.types.Object]:
-    """Return all Armature objects under `coll` (recursive)."""
-    return [o for o in _all_objects_in_collection(coll) if o.type == 'ARMATURE']
+    """Return all Armature objects under `coll` (recursive), most likely rig first (see utils.rig_index)."""
+    return get_rig_index().rigs_in(coll)
 
 
-def pick_preferred_rig(rigs: list[bpy.types.Object]) -> bpy.types.Object | None:
-    """Pick the 'best' rig using a simple heuristic."""
-    if not rigs:
-        return None
-    if len(rigs) == 1:
-        return rigs[0]
-    # Multiple rigs → score them and pick the highest
-    scored = sorted(rigs, key=_score_rig_candidate, reverse=True)
-    return scored[0]
+def pick_preferred_rig(coll: bpy.types.Collection) -> bpy.types.Object | None:
+    """Pick the 'best' rig under `coll` using the scoring heuristics from the add-on preferences."""
+    return get_rig_index().preferred(coll)
 
 
 # Add constraints to lights to track character rig
@@ -151,47 +87,27 @@ def find_light_root_candidate(coll: bpy.types.Collection, suffix: str):
     return None
 
 
-def ensure_child_of_to_c_traj(root_obj: bpy.types.Object, rig: bpy.types.Object, is_napo: bool = False, reporter=None) -> bool:
-    """
-    Adds Child Of to root_obj targeting rig's 'c_traj' bone and clear inverse to keep current world transform.
-    Returns True on success.
-    """
-    if rig is None or rig.type != 'ARMATURE':
-        if reporter: reporter({'WARNING'}, "No valid rig (Armature) to constrain to.")
-        return False
-
-    # Find the bone to target: prefer 'c_traj', fallback to 'body'
-    pb = None
-    if rig.pose:
-        if not is_napo:
-            pb = rig.pose.bones.get("c_traj") or rig.pose.bones.get("body")
-        else:
-            pb = rig.pose.bones.get("c_body")
+def find_child_of_bone(rig: bpy.types.Object, is_napo: bool = False):
+    """The standard Child Of bone of a rig: 'c_traj', falling back to 'body' ('c_body' for napo); None if missing."""
+    if not rig.pose:
+        return None
+    if is_napo:
+        return rig.pose.bones.get("c_body")
+    return rig.pose.bones.get("c_traj") or rig.pose.bones.get("body")
 
-    if pb is None:
-        bpy.ops.bls.set_child_of_bone_popup('INVOKE_DEFAULT', rig_obj=rig)
-        if reporter:
-            reporter({'INFO'}, "Please pick a bone to use for Child Of constraint.")
-        pb = rig.pose.bones.get(CUSTOM_BONE_NAME)
-        if pb is None:
-            if reporter:
-                reporter({'WARNING'}, f"Rig has no pose bone named '{CUSTOM_BONE_NAME}'.")
-            return False
-        else:
-            if reporter:
-                reporter({'WARNING'}, "Rig has neither 'c_traj' nor 'body' pose bone.")
-            return False
 
+def add_child_of_constraint(root_obj: bpy.types.Object, rig: bpy.types.Object, bone_name: str):
+    """Add (or reuse) a Child Of on root_obj targeting rig's bone and clear its inverse. Returns the constraint."""
     # Reuse existing matching constraint if any
     con = None
     for c in root_obj.constraints:
-        if c.type == 'CHILD_OF' and c.target == rig and c.subtarget == pb.name:
+        if c.type == 'CHILD_OF' and c.target == rig and c.subtarget == bone_name:
             con = c
             break
     if con is None:
         con = root_obj.constraints.new(type='CHILD_OF')
         con.target = rig
-        con.subtarget = pb.name
+        con.subtarget = bone_name
 
     # Try to clear inverse that preserves current world matrix
     con.inverse_matrix = mathutils.Matrix.Identity(4)
@@ -201,6 +117,27 @@ def ensure_child_of_to_c_traj(root_obj: bpy.types.Object, rig: bpy.types.Object,
     con.use_location_x = con.use_location_y = con.use_location_z = True
     con.use_rotation_x = con.use_rotation_y = con.use_rotation_z = True
     con.use_scale_x = con.use_scale_y = con.use_scale_z = True
+    return con
+
+
+def ensure_child_of_to_c_traj(root_obj: bpy.types.Object, rig: bpy.types.Object, is_napo: bool = False,
+                              reporter=None) -> bool:
+    """
+    Adds Child Of to root_obj targeting rig's 'c_traj' bone and clear inverse to keep current world transform.
+    Returns True on success; False when the rig has no standard bone (see setup_character_lighting for the
+    interactive bone picker).
+    """
+    if rig is None or rig.type != 'ARMATURE':
+        if reporter: reporter({'WARNING'}, "No valid rig (Armature) to constrain to.")
+        return False
+
+    pb = find_child_of_bone(rig, is_napo)
+    if pb is None:
+        if reporter:
+            reporter({'WARNING'}, f"Rig '{rig.name}' has neither 'c_traj' nor 'body' pose bone.")
+        return False
+
+    add_child_of_constraint(root_obj, rig, pb.name)
     return True
 
 
@@ -215,14 +152,18 @@ def find_named_light(coll: bpy.types.Collection, base: str, suffix: str):
     return cands[0] if len(cands) == 1 else None
 
 
-def ensure_shared_receiver_collection(rcv_name: str) -> bpy.types.Collection:
+def ensure_shared_receiver_collection(rcv_name: str, journal: IDJournal | None = None) -> bpy.types.Collection:
     """
     Create or reuse a single receiver collection for light linking.
     It will be assigned to lights, but unlinked from all scene parents after setup.
-    Returns the collection.
+    A newly created receiver is recorded in 'journal'. Returns the collection.
     """
     # Create or reuse receiver
-    rcv = bpy.data.collections.get(rcv_name) or bpy.data.collections.new(rcv_name)
+    rcv = bpy.data.collections.get(rcv_name)
+    if rcv is None:
+        rcv = bpy.data.collections.new(rcv_name)
+        if journal is not None:
+            journal.record_created(rcv)
     return rcv
 
 
@@ -240,36 +181,248 @@ def assign_receiver_collection_to_light(light: bpy.types.Object, rcv: bpy.types.
         return False
 
 
-def add_active_collection_to_receiver(rcv: bpy.types.Collection, active_coll: bpy.types.Collection) -> bool:
+def add_active_collection_to_receiver(rcv: bpy.types.Collection, active_coll: bpy.types.Collection,
+                                      journal: IDJournal | None = None) -> bool:
     """
     Add the active collection as a child of the shared receiver collection (no flags, just like the UI).
+    The link is recorded in 'journal' so a rollback can undo it.
     """
     if active_coll.name not in rcv.children.keys():
-        rcv.children.link(active_coll)
+        if journal is not None:
+            journal.link_child(rcv, active_coll)
+        else:
+            rcv.children.link(active_coll)
         return True
     return False
 
 
-def delete_collection(coll: bpy.types.Collection):
-    """Unlink and delete the given collection."""
-    # Unlink from all parents
-
-    if coll:
-        # First unlink it from all scenes and parent collections
-        for scene in bpy.data.scenes:
-            if coll.name in scene.collection.children:
-                scene.collection.children.unlink(coll)
-        for parent in bpy.data.collections:
-            if coll.name in parent.children:
-                parent.children.unlink(coll)
-        for obj in list(coll.objects):
-            bpy.data.objects.remove(obj, do_unlink=True)
-
-        # Finally, remove it from bpy.data entirely
-        bpy.data.collections.remove(coll)
-        print(f"Deleted collection: {coll.name}")
+# ------------------------------------------------------------------------
+# Lighting Setup - Per-Character Pipeline
+# ------------------------------------------------------------------------
+def character_suffix(coll_name: str) -> str | None:
+    """'c-napo' -> 'napo'; None when the collection is not a 'c-' character collection."""
+    if not coll_name.lower().startswith("c-"):
+        return None
+    return coll_name[2:] or coll_name  # handle 'c-' edge-case
+
+
+def ensure_rimfill_collection(scene: bpy.types.Scene, journal: IDJournal | None = None) -> bpy.types.Collection:
+    """Return the 'RIMFILL' collection, creating it under the scene root (and recording it in 'journal') if needed."""
+    rimfill = bpy.data.collections.get("RIMFILL")
+    if rimfill is None:
+        rimfill = bpy.data.collections.new("RIMFILL")
+        scene.collection.children.link(rimfill)
+        if journal is not None:
+            journal.record_created(rimfill)
+    return rimfill
+
+
+def new_lighting_setup(context, filepath: str, use_override: bool = False,
+                       journal: IDJournal | None = None) -> bpy.types.Collection:
+    """
+    Fresh, unlinked LightingSetup collection for one character: an in-memory copy of the
+    cached template, or a library override of the linked template. Every ID it creates is
+    recorded in 'journal'. Raises on load errors.
+    """
+    if use_override:
+        return instantiate_override(filepath, 'LightingSetup', context.scene, context.view_layer, journal)
+    return instantiate_template(filepath, 'LightingSetup', journal)
+
+
+def setup_character_lighting(coll: bpy.types.Collection, active_coll: bpy.types.Collection,
+                             rig: bpy.types.Object, rimfill: bpy.types.Collection, suffix: str, key: str,
+                             reporter, interactive: bool = True, journal: IDJournal | None = None) -> dict:
+    """
+    Turn a fresh copy of the LightingSetup collection into the rig for one character:
+    link it under RIMFILL as 'rf-<suffix>', suffix its objects, constrain the light root
+    to the rig and set up light linking. The rig should already be in REST position.
+    On failure everything recorded in 'journal' (the copy, its data, a new receiver) is rolled back.
+
+    When the rig has no standard Child Of bone and 'interactive' is set, the remaining stages are
+    stored in a pending setup and the bone picker is opened; it resumes them (constraint, light
+    linking, pose restore) when confirmed, or rolls back when cancelled.
+
+    Returns a result row: status ('OK', 'PENDING', 'NO ROOT', 'NO BONE'), whether the
+    collection got its 'rf-' name, renamed object count, light root, fill and rim light names.
+    """
+    if journal is None:
+        journal = IDJournal()
+        journal.record_tree(coll)
+
+    sel_name = active_coll.name
+    result = {"collection": sel_name, "rig": rig.name, "status": 'OK', "collection_renamed": False, "renamed": 0,
+              "root": "", "fill": "", "rim": ""}
+
+    # Link under RIMFILL (not the scene root)
+    ensure_root_child(rimfill, coll)
+
+    # Rename collection to 'rf-<suffix>'
+    target_name = unique_collection_name(f"rf-{suffix}")
+    try:
+        coll.name = target_name
+        result["collection_renamed"] = True
+    except Exception as e:
+        reporter({'WARNING'}, f"Could not rename appended collection: {e}")
+
+    # Rename all objects inside the collection to include _<suffix>
+    renamed_count = add_suffix_to_objects_in_collection(coll, suffix, key, reporter)
+    result["renamed"] = renamed_count
+    if renamed_count:
+        reporter({'INFO'}, f"Renamed {renamed_count} object(s) to include _{suffix}.")
     else:
-        print(f"Collection '{coll.name}' not found.")
+        # Every name already carries the suffix; nothing to fix, carry on with the setup
+        reporter({'INFO'}, f"No object names needed _{suffix} (already suffixed or none found).")
+
+    ## Set lighting to character's rig
+    light_root = find_light_root_candidate(coll, suffix)
+    if not light_root:
+        reporter({'WARNING'}, f"No root light found in '{coll.name}'. Expected 'light_root_{suffix}'.")
+        return _fail_setup(journal, result, 'NO ROOT', reporter)
+    result["root"] = light_root.name
+
+    ### SPECIAL CASE NAPO
+    is_napo = sel_name == "c-napo"
+    if interactive and rig.type == 'ARMATURE' and find_child_of_bone(rig, is_napo) is None:
+        # Non-standard rig: let the user pick the bone; the picker runs the remaining stages
+        pending_id = defer_setup(PendingSetup(coll, active_coll, rig, light_root, suffix, journal, result))
+        try:
+            invoked = bpy.ops.bls.set_child_of_bone_popup('INVOKE_DEFAULT', rig_obj=rig, pending_id=pending_id)
+        except RuntimeError as e:
+            invoked = {'CANCELLED'}
+            print(f"Could not open the bone picker: {e}")
+        if 'CANCELLED' in invoked:
+            _pending.pop(pending_id, None)
+            reporter({'WARNING'}, "Could not open the bone picker for the Child Of constraint.")
+            return _fail_setup(journal, result, 'NO BONE', reporter)
+        reporter({'INFO'}, "Please pick a bone to use for Child Of constraint; the setup continues once confirmed.")
+        # The journal now belongs to the pending setup: the picker commits it or rolls it back
+        result["pending_id"] = pending_id
+        result["status"] = 'PENDING'
+        return result
+
+    if ensure_child_of_to_c_traj(root_obj=light_root, rig=rig, is_napo=is_napo, reporter=reporter):
+        reporter({'INFO'}, f"Added Child Of (target: {rig.name}, bone: c_traj or body) to '{light_root.name}'.")
+    else:
+        reporter({'WARNING'}, f"Could not complete Child Of setup for '{light_root.name}'.")
+        return _fail_setup(journal, result, 'NO BONE', reporter)
+
+    link_character_lights(coll, active_coll, suffix, reporter, journal, result)
+    return result
+
+
+def link_character_lights(coll: bpy.types.Collection, active_coll: bpy.types.Collection, suffix: str, reporter,
+                          journal: IDJournal | None = None, result: dict | None = None):
+    """Light linking stage: fill and rim lights of 'coll' share one 'LL_<suffix>' receiver holding active_coll."""
+    sel_name = active_coll.name
+    fill_light = find_named_light(coll, "l-fill", suffix)
+    rim_light = find_named_light(coll, "l-rim", suffix)
+    if result is not None:
+        result["fill"] = fill_light.name if fill_light else ""
+        result["rim"] = rim_light.name if rim_light else ""
+
+    # One shared receiver collection name, e.g. ties to the suffix or rf-collection name
+    shared_rcv = ensure_shared_receiver_collection(f"LL_{suffix}", journal)  # or f"LL_rf-{suffix}" if you prefer
+    if not shared_rcv:
+        reporter({'WARNING'}, "Light Linking API not available; skipped receiver collection setup.")
+        return
+
+    # Assign both lights to the SAME receiver collection
+    for light in (fill_light, rim_light):
+        if not light:
+            continue
+        if assign_receiver_collection_to_light(light, shared_rcv):
+            reporter({'INFO'}, f"'{light.name}' uses shared receiver '{shared_rcv.name}'.")
+        else:
+            reporter({'WARNING'}, f"Failed to assign receiver to '{light.name}'.")
+
+    # Add the active collection once to the shared receiver
+    if add_active_collection_to_receiver(shared_rcv, active_coll, journal):
+        reporter({'INFO'}, f"Added '{sel_name}' to shared receiver '{shared_rcv.name}'.")
+    else:
+        reporter({'INFO'}, f"'{sel_name}' already present in shared receiver '{shared_rcv.name}'.")
+
+
+def _fail_setup(journal: IDJournal, result: dict, status: str, reporter) -> dict:
+    removed = journal.rollback()
+    reporter({'INFO'}, f"Rolled back the lighting setup for '{result['collection']}' ({removed} datablock(s) removed).")
+    result["status"] = status
+    return result
+
+
+# ------------------------------------------------------------------------
+# Lighting Setup - Pending Setups (Child Of bone picker)
+# ------------------------------------------------------------------------
+class PendingSetup:
+    """
+    A character setup waiting for the user to pick a Child Of bone. Holds what the remaining
+    stages (constraint, light linking, pose restore) need, and the journal to roll back on cancel.
+    Only valid until the file is reloaded or undone; such records are dropped.
+    """
+
+    def __init__(self, coll, active_coll, rig, light_root, suffix, journal, result):
+        self.coll = coll
+        self.active_coll = active_coll
+        self.rig = rig
+        self.light_root = light_root
+        self.suffix = suffix
+        self.journal = journal
+        self.result = result
+
+
+_pending = {}  # id -> PendingSetup
+_pending_ids = itertools.count(1)
+
+
+def defer_setup(pending: PendingSetup) -> str:
+    """Store a pending setup; returns the id the bone picker resumes it with."""
+    pending_id = str(next(_pending_ids))
+    _pending[pending_id] = pending
+    return pending_id
+
+
+def resume_setup(pending_id: str, bone_name: str, reporter, rig: bpy.types.Object | None = None) -> dict | None:
+    """
+    Run the remaining stages of a pending setup with the picked bone (of 'rig', default the detected
+    rig): Child Of constraint, light linking and pose restore. Rolls back when the bone is missing.
+    Returns the result row, or None when no such setup is pending.
+    """
+    pending = _pending.pop(pending_id, None)
+    if pending is None:
+        reporter({'WARNING'}, "The lighting setup waiting for this bone is gone (file reloaded or undone).")
+        return None
+    target = rig or pending.rig
+    result = pending.result
+    try:
+        if target.pose is None or target.pose.bones.get(bone_name) is None:
+            reporter({'WARNING'}, f"Rig has no pose bone named '{bone_name}'.")
+            return _fail_setup(pending.journal, result, 'NO BONE', reporter)
+
+        add_child_of_constraint(pending.light_root, target, bone_name)
+        reporter({'INFO'}, f"Added Child Of (target: {target.name}, bone: {bone_name}) "
+                           f"to '{pending.light_root.name}'.")
+        link_character_lights(pending.coll, pending.active_coll, pending.suffix, reporter, pending.journal, result)
+        pending.journal.commit()
+        result["rig"] = target.name
+        result["status"] = 'OK'
+        return result
+    finally:
+        # The detected rig was put in REST position for the setup
+        pending.rig.data.pose_position = 'POSE'
+
+
+def cancel_setup(pending_id: str, reporter) -> None:
+    """Roll back a pending setup whose bone picker was cancelled, and restore the rig's pose."""
+    pending = _pending.pop(pending_id, None)
+    if pending is None:
+        return
+    _fail_setup(pending.journal, pending.result, 'NO BONE', reporter)
+    pending.rig.data.pose_position = 'POSE'
+
+
+@handlers.on_reset
+def _on_reset():
+    # The IDs a pending setup points at do not survive a file load or undo
+    _pending.clear()
 
 
 # ------------------------------------------------------------------------
@@ -301,8 +454,7 @@ class LIGHTINGSETUP_OT_AppendBlend(bpy.types.Operator):
         sel_name = active_coll.name
 
         ## Detect rig in selected collection
-        rigs = find_rigs_in_collection(active_coll)
-        rig = pick_preferred_rig(rigs)
+        rig = pick_preferred_rig(active_coll)
 
         if rig is None:
             self.report({'WARNING'}, f"No rig (Armature) found under collection '{sel_name}'.")
@@ -316,113 +468,50 @@ class LIGHTINGSETUP_OT_AppendBlend(bpy.types.Operator):
             rig.select_set(True)
             context.view_layer.objects.active = rig
             self.report({'INFO'}, f"Detected rig: {rig.name} in collection '{sel_name}'.")
-        rig.data.pose_position = 'REST'
 
-        ## Check if collection name starts with 'c-'
-        if sel_name.lower().startswith("c-"):
-            suffix = sel_name[2:] or sel_name  # handle 'c-' edge-case
-        else:
-            self.report({'WARNING'},
-                        f"Active collection '{sel_name}' doesn't start with 'c-'. Continuing and keeping name.")
+        ## Check if collection name starts with 'c-' (before touching the rig's pose)
+        suffix = character_suffix(sel_name)
+        if suffix is None:
+            self.report({'WARNING'}, f"Active collection '{sel_name}' doesn't start with 'c-'.")
             return {'CANCELLED'}
+        rig.data.pose_position = 'REST'
+
+        ## Everything created from here on is journaled, so a failed setup leaves nothing behind
+        journal = IDJournal()
 
         ## Ensure 'RIMFILL' collection exists
-        rimfill = bpy.data.collections.get("RIMFILL")
-        if rimfill is None:
-            rimfill = bpy.data.collections.new("RIMFILL")
-            context.scene.collection.children.link(rimfill)
+        rimfill = ensure_rimfill_collection(context.scene, journal)
 
-        ## Append 'LightingSetup' collection from blend file
+        ## Copy (or override) 'LightingSetup' from the cached template; the blend file is only read when it changed
         try:
-            with bpy.data.libraries.load(filepath, link=False) as (data_from, data_to):
-                if 'LightingSetup' in data_from.collections:
-                    data_to.collections = ['LightingSetup']
-                else:
-                    self.report({'ERROR'}, "No 'LightingSetup' collection found in the blend file.")
-                    return {'CANCELLED'}
+            coll = new_lighting_setup(context, filepath, props.use_library_override, journal)
         except Exception as e:
+            journal.rollback()
+            rig.data.pose_position = 'POSE'
             self.report({'ERROR'}, f"Failed to load library: {e}")
             return {'CANCELLED'}
 
-        ## Rename appended collections to 'rf-' and link under RIMFILL
-        renamed_any = False
-        for coll in getattr(data_to, "collections", []):
-            if coll is None:
-                continue
-            # Link under RIMFILL (not the scene root)
-            ensure_root_child(rimfill, coll)
-
-            # Rename collection to 'rf-<suffix>'
-            target_name = unique_collection_name(f"rf-{suffix}")
-            try:
-                coll.name = target_name
-                renamed_any = True
-            except Exception as e:
-                self.report({'WARNING'}, f"Could not rename appended collection: {e}")
-
-            # Rename all objects inside the collection to include _<suffix>
-            renamed_count = add_suffix_to_objects_in_collection(coll, suffix, properties_props.key)
-            if renamed_count:
-                self.report({'INFO'}, f"Renamed {renamed_count} object(s) to include _{suffix}.")
-
-                ## Set lighting to character's rig
-                rig.data.pose_position = 'REST'
-                light_root = find_light_root_candidate(coll, suffix)
-                if light_root and rig:
-                    ### SPECIAL CASE NAPO
-                    if ensure_child_of_to_c_traj(root_obj=light_root,rig=rig,is_napo=(sel_name == "c-napo"),reporter=self.report):
-                        self.report({'INFO'},
-                                    f"Added Child Of (target: {rig.name}, bone: c_traj or body) to '{light_root.name}'.")
-                    else:
-                        self.report({'WARNING'}, f"Could not complete Child Of setup for '{light_root.name}'.")
-                        delete_collection(coll)
-                else:
-                    if not light_root:
-                        self.report({'WARNING'},
-                                    f"No root light found in '{coll.name}'. Expected 'light_root_{suffix}'.")
-                    if not rig:
-                        self.report({'WARNING'}, f"No rig detected under active collection '{sel_name}'.")
-                    delete_collection(coll)
-
-
-                ## Set up light linking for fill and rim lights
-                fill_light = find_named_light(coll, "l-fill", suffix)
-                rim_light = find_named_light(coll, "l-rim", suffix)
-
-                # One shared receiver collection name, e.g. ties to the suffix or rf-collection name
-                shared_rcv = ensure_shared_receiver_collection(f"LL_{suffix}")  # or f"LL_rf-{suffix}" if you prefer
-                if not shared_rcv:
-                    self.report({'WARNING'}, "Light Linking API not available; skipped receiver collection setup.")
-                else:
-                    # Assign both lights to the SAME receiver collection
-                    if fill_light:
-                        ok_fill = assign_receiver_collection_to_light(fill_light, shared_rcv)
-                        if ok_fill:
-                            self.report({'INFO'}, f"'{fill_light.name}' uses shared receiver '{shared_rcv.name}'.")
-                        else:
-                            self.report({'WARNING'}, f"Failed to assign receiver to '{fill_light.name}'.")
-
-                    if rim_light:
-                        ok_rim = assign_receiver_collection_to_light(rim_light, shared_rcv)
-                        if ok_rim:
-                            self.report({'INFO'}, f"'{rim_light.name}' uses shared receiver '{shared_rcv.name}'.")
-                        else:
-                            self.report({'WARNING'}, f"Failed to assign receiver to '{rim_light.name}'.")
-
-                    # Add the active collection once to the shared receiver
-                    if add_active_collection_to_receiver(shared_rcv, active_coll):
-                        self.report({'INFO'}, f"Added '{sel_name}' to shared receiver '{shared_rcv.name}'.")
-                    else:
-                        self.report({'INFO'}, f"'{sel_name}' already present in shared receiver '{shared_rcv.name}'.")
-
-
-            else:
-                self.report({'INFO'}, f"No object names needed _{suffix} (already suffixed or none found).")
-
-        if not renamed_any:
+        ## Rename to 'rf-', link under RIMFILL, constrain to the rig and set up light linking
+        try:
+            result = setup_character_lighting(coll, active_coll, rig, rimfill, suffix, properties_props.key,
+                                              self.report, journal=journal)
+        except Exception as e:
+            journal.rollback()
+            rig.data.pose_position = 'POSE'
+            self.report({'ERROR'}, f"Lighting setup for '{sel_name}' failed: {e}")
+            return {'CANCELLED'}
+        if result["status"] == 'PENDING':
+            # Handed off with the journal: the bone picker finishes the setup (constraint, light linking,
+            # pose restore) and commits it when confirmed, or rolls it back when cancelled
+            return {'FINISHED'}
+        rig.data.pose_position = 'POSE'
+        if result["status"] != 'OK':
+            self.report({'WARNING'}, f"Lighting setup for '{sel_name}' failed ({result['status']}); nothing was kept.")
+            return {'CANCELLED'}
+        journal.commit()
+        if not result["collection_renamed"]:
             self.report({'WARNING'}, "Lighting setup appended but renaming may have failed.")
 
-        rig.data.pose_position = 'POSE'
         self.report({'INFO'}, f"Lighting setup appended into 'RIMFILL' as 'rm-{suffix}'.")
         return {'FINISHED'}
 
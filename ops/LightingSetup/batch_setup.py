@@ -0,0 +1,166 @@
+import bpy
+from ...utils.file_manager import FileManager
+from ...utils.hierarchy_index import HierarchyIndex
+from ...utils.id_journal import IDJournal
+from ...utils.template_cache import get_linked_template, get_template
+from ...utils.rig_index import get_rig_index
+from .append_blend import character_suffix, ensure_rimfill_collection, new_lighting_setup, setup_character_lighting
+
+REPORT_COLUMNS = (("collection", "Collection"), ("rig", "Rig"), ("status", "Status"), ("renamed", "Renamed"),
+                  ("root", "Light Root"), ("fill", "Fill"), ("rim", "Rim"))
+
+
+# ------------------------------------------------------------------------
+# Helpers
+# ------------------------------------------------------------------------
+def find_character_collections(scene, hierarchy, selected_objects=None):
+    """
+    'c-' collections under the scene, sorted by name. With selected_objects, only those
+    that hold (directly or through child collections) one of the selected objects.
+    """
+    if selected_objects is None:
+        found = {c for c in hierarchy.depth if character_suffix(c.name) is not None}
+    else:
+        found = set()
+        for obj in selected_objects:
+            for holder in hierarchy.collections_with(obj):
+                # Nearest 'c-' collection on the way up from the object
+                for coll in reversed(hierarchy.path(holder)):
+                    if character_suffix(coll.name) is not None:
+                        found.add(coll)
+                        break
+    return sorted(found, key=lambda c: c.name)
+
+
+def format_report_table(rows) -> str:
+    """Plain-text table of per-character results, one line per character."""
+    widths = [max([len(title)] + [len(str(r[k])) for r in rows]) for k, title in REPORT_COLUMNS]
+    lines = ["  ".join(title.ljust(w) for (_k, title), w in zip(REPORT_COLUMNS, widths))]
+    lines.append("  ".join("-" * w for w in widths))
+    for r in rows:
+        lines.append("  ".join(str(r[k]).ljust(w) for (k, _title), w in zip(REPORT_COLUMNS, widths)))
+    return "\n".join(lines)
+
+
+# ------------------------------------------------------------------------
+# Lighting Setup - Batch Append
+# ------------------------------------------------------------------------
+class LIGHTINGSETUP_OT_BatchAppendBlend(bpy.types.Operator):
+    bl_idname = "bls.batch_append_blend"
+    bl_label = "Batch Lighting Setup"
+    bl_description = "Append the lighting setup for many 'c-' character collections in one step"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    scope: bpy.props.EnumProperty(
+        name="Characters",
+        items=[
+            ('ALL', "All", "Every 'c-' collection in the scene"),
+            ('SELECTED', "Selected", "'c-' collections that hold a selected object"),
+        ],
+        default='ALL',
+    )
+    skip_existing: bpy.props.BoolProperty(
+        name="Skip Existing",
+        description="Skip characters that already have an 'rf-<name>' lighting collection",
+        default=True,
+    )
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+
+    def execute(self, context):
+        scene = context.scene
+        filepath = FileManager.get_filepath(scene.lighting_setup.filepath)
+        if not filepath:
+            self.report({'ERROR'}, "No presets file path specified")
+            return {'CANCELLED'}
+        key = scene.lighting_props.key
+        use_override = scene.lighting_setup.use_library_override
+
+        hierarchy = HierarchyIndex([scene.collection])
+        selected = context.selected_objects if self.scope == 'SELECTED' else None
+        characters = find_character_collections(scene, hierarchy, selected)
+        if not characters:
+            self.report({'WARNING'}, "No 'c-' character collections found.")
+            return {'CANCELLED'}
+
+        # Plan: resolve rigs from the shared rig index and skip what cannot or need not be set up
+        rig_index = get_rig_index()
+        rows, jobs = [], []
+        for coll in characters:
+            suffix = character_suffix(coll.name)
+            rig = rig_index.preferred(coll)
+            row = {"collection": coll.name, "rig": rig.name if rig else "", "status": "", "renamed": 0,
+                   "root": "", "fill": "", "rim": ""}
+            rows.append(row)
+            if rig is None:
+                row["status"] = 'NO RIG'
+            elif self.skip_existing and bpy.data.collections.get(f"rf-{suffix}") is not None:
+                row["status"] = 'EXISTS'
+            else:
+                jobs.append((row, coll, rig, suffix))
+
+        if jobs:
+            # One library load for the whole batch; every character gets an in-memory copy or an override
+            try:
+                (get_linked_template if use_override else get_template)(filepath, 'LightingSetup')
+            except Exception as e:
+                self.report({'ERROR'}, f"Failed to load library: {e}")
+                return {'CANCELLED'}
+
+            # Flip every rig to REST together so the depsgraph evaluates once, not per character
+            rigs = {rig.as_pointer(): rig for _row, _coll, rig, _suffix in jobs}
+            for rig in rigs.values():
+                rig.data.pose_position = 'REST'
+            context.view_layer.update()
+
+            # RIMFILL is only kept if at least one character ends up under it
+            shared = IDJournal()
+            try:
+                rimfill = ensure_rimfill_collection(scene, shared)
+                for row, coll, rig, suffix in jobs:
+                    # One journal per character: a failure only rolls back that character's copy
+                    journal = IDJournal()
+                    messages = []
+                    try:
+                        result = setup_character_lighting(new_lighting_setup(context, filepath, use_override, journal),
+                                                          coll, rig, rimfill, suffix, key,
+                                                          lambda level, msg: messages.append(msg),
+                                                          interactive=False, journal=journal)
+                    except Exception as e:
+                        journal.rollback()
+                        messages.append(str(e))
+                        result = {"status": 'FAILED'}
+                    journal.commit()
+                    row.update(result)
+                    row["messages"] = messages
+                    if result["status"] != 'OK':
+                        print(f"[{coll.name}] " + " | ".join(messages))
+            finally:
+                if any(row["status"] == 'OK' for row, _coll, _rig, _suffix in jobs):
+                    shared.commit()
+                else:
+                    shared.rollback()
+                for rig in rigs.values():
+                    rig.data.pose_position = 'POSE'
+
+        print("Batch lighting setup\n" + format_report_table(rows))
+        for r in rows:
+            if r["status"] != 'OK':
+                detail = r.get("messages")
+                self.report({'WARNING'}, f"{r['collection']}: {r['status']}"
+                                         + (f" ({detail[-1]})" if detail else ""))
+        done = sum(1 for r in rows if r["status"] == 'OK')
+        self.report({'INFO'} if done == len(rows) else {'WARNING'},
+                    (f"Lighting set up for {done}/{len(rows)} character(s) | "
+                     f"Skipped: {sum(1 for r in rows if r['status'] in ('NO RIG', 'EXISTS'))} | "
+                     f"See console for the report table"))
+        return {'FINISHED'}
+
+
+def register():
+    bpy.utils.register_class(LIGHTINGSETUP_OT_BatchAppendBlend)
+
+
+def unregister():
+    bpy.utils.unregister_class(LIGHTINGSETUP_OT_BatchAppendBlend)
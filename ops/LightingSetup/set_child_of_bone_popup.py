@@ -1,25 +1,102 @@
 import bpy
+from ...utils import handlers
+from .append_blend import cancel_setup, resume_setup
 
-# Global "return value"
-CUSTOM_BONE_NAME = None
+# Likely Child Of targets, best first; other controller ('c_') bones follow them
+PRIORITY_BONES = ("c_traj", "body", "c_body")
+CONTROLLER_PREFIX = "c_"
+MAX_FILTERED_LISTS = 32
+
+# Blender only keeps the strings of dynamic enum items alive while Python does, so every
+# items list handed out is held here: (rig pointer, bone count) -> bone list.
+# Each item carries its position in the full ranked list as its value, so the stored choice
+# keeps pointing at the same bone when the search swaps in a filtered list.
+NO_BONE_VALUE = -1
+_NO_BONES = [("", "<no bones>", "", NO_BONE_VALUE)]
+_NO_MATCH = [("", "<no matching bones>", "", NO_BONE_VALUE)]
+_bone_lists = {}
 
 
 def _poll_armature(self, obj):
     return (obj is not None) and (obj.type == 'ARMATURE')
 
 
+def _bone_rank(name: str, index: int):
+    if name in PRIORITY_BONES:
+        return 0, PRIORITY_BONES.index(name)
+    if name.startswith(CONTROLLER_PREFIX):
+        return 1, index
+    return 2, index
+
+
+class BoneList:
+    """
+    Ranked enum items for one rig's pose bones with a lowercase name index for searching.
+    Filtered item lists are cached per search text, so redraws reuse them.
+    """
+
+    def __init__(self, rig):
+        names = [pb.name for pb in rig.pose.bones]
+        ranked = sorted(range(len(names)), key=lambda i: _bone_rank(names[i], i))
+        self.names = [names[i] for i in ranked]
+        self.lower = [n.lower() for n in self.names]
+        self.items = [(n, n, "", i) for i, n in enumerate(self.names)] or _NO_BONES
+        self.filtered = {}  # lowercase search text -> items
+
+    def search(self, text: str):
+        """Items whose name starts with 'text' first, then those that merely contain it (the same tuples)."""
+        text = text.strip().lower()
+        if not text or not self.names:
+            return self.items
+        items = self.filtered.get(text)
+        if items is None:
+            prefix = [i for i, n in enumerate(self.lower) if n.startswith(text)]
+            inner = [i for i, n in enumerate(self.lower) if text in n and not n.startswith(text)]
+            items = [self.items[i] for i in prefix + inner] or _NO_MATCH
+            if len(self.filtered) >= MAX_FILTERED_LISTS:
+                self.filtered.clear()
+            self.filtered[text] = items
+        return items
+
+
+def get_bone_list(rig) -> BoneList | None:
+    """Cached BoneList of an armature, rebuilt when its bone count changes."""
+    if not (rig and rig.type == 'ARMATURE' and rig.pose):
+        return None
+    key = (rig.as_pointer(), len(rig.pose.bones))
+    bones = _bone_lists.get(key)
+    if bones is None:
+        # Drop this rig's outdated list (other bone count) before caching the new one
+        for old in [k for k in _bone_lists if k[0] == key[0]]:
+            del _bone_lists[old]
+        bones = _bone_lists[key] = BoneList(rig)
+    return bones
+
+
 def _enum_bones(self, context):
-    rig = self.rig_obj
-    if rig and rig.type == 'ARMATURE' and rig.pose:
-        return [(pb.name, pb.name, "") for pb in rig.pose.bones]
-    return [("", "<no bones>", "")]
+    bones = get_bone_list(self.rig_obj)
+    if bones is None:
+        return _NO_BONES
+    return bones.search(self.bone_search)
+
+
+@handlers.on_reset
+def _on_reset():
+    # Pointers are not stable across file loads and undo
+    _bone_lists.clear()
 
 
 class LIGHTINGSETUP_OT_set_child_of_bone_popup(bpy.types.Operator):
-    """Pick a rig and a bone; stores result in CUSTOM_BONE_NAME"""
+    """Pick a rig and a bone; with a pending lighting setup, finish it using that bone"""
     bl_idname = "bls.set_child_of_bone_popup"
     bl_label = "Select Bone"
-    bl_options = {'REGISTER', 'UNDO'}
+    # No redo panel: redoing would undo the resumed setup without running it again
+    bl_options = {'UNDO'}
+
+    # Lighting setup waiting for this bone (see append_blend.defer_setup)
+    pending_id: bpy.props.StringProperty(
+        options={'HIDDEN', 'SKIP_SAVE'}
+    )
 
     # Let user pick a rig (searchable field that filters to Armatures)
     rig_obj: bpy.props.PointerProperty(
@@ -28,12 +105,18 @@ class LIGHTINGSETUP_OT_set_child_of_bone_popup(bpy.types.Operator):
         poll=_poll_armature
     )
 
-    # Dropdown populated from rig.pose.bones
+    # Narrows the bone dropdown; prefix matches are listed before substring matches
+    bone_search: bpy.props.StringProperty(
+        name="Search",
+        description="Only list bones whose name starts with or contains this text",
+        options={'SKIP_SAVE', 'TEXTEDIT_UPDATE'}
+    )
+
+    # Dropdown populated from rig.pose.bones, likely controller bones first
     bone_name: bpy.props.EnumProperty(
         name="Bone",
         items=_enum_bones,
         description="Choose a pose bone from the selected rig",
-        options={'ENUM_FLAG'}
     )
 
     def invoke(self, context, event):
@@ -45,36 +128,52 @@ class LIGHTINGSETUP_OT_set_child_of_bone_popup(bpy.types.Operator):
                 arm = next((o for o in context.scene.objects if o.type == 'ARMATURE'), None)
             self.rig_obj = arm
 
-        # Preselect common bones
-        rig = self.rig_obj
-        if rig and rig.pose:
-            if "c_traj" in rig.pose.bones:
-                self.bone_name = "c_traj"
-            elif "body" in rig.pose.bones:
-                self.bone_name = "body"
+        # Preselect the most likely bone (c_traj, body, c_body), ranked first in the list
+        bones = get_bone_list(self.rig_obj)
+        if bones and bones.names and bones.names[0] in PRIORITY_BONES:
+            self.bone_name = bones.names[0]
 
         return context.window_manager.invoke_props_dialog(self)
 
     def draw(self, context):
         col = self.layout.column(align=True)
         col.prop(self, "rig_obj")
+        col.prop(self, "bone_search", icon='VIEWZOOM')
         col.prop(self, "bone_name")
 
     def execute(self, context):
-        global CUSTOM_BONE_NAME
         rig = self.rig_obj
 
+        error = None
         if not (rig and rig.type == 'ARMATURE'):
-            self.report({'ERROR'}, "Pick a valid Armature rig.")
-            return {'CANCELLED'}
-        if not self.bone_name:
-            self.report({'ERROR'}, "Pick a bone.")
+            error = "Pick a valid Armature rig."
+        elif not self.bone_name:
+            # Also the '<no matching bones>' item of a search without results
+            error = "Pick a bone."
+        elif not any(item[0] == self.bone_name for item in _enum_bones(self, context)):
+            error = f"Bone '{self.bone_name}' is not in the filtered list; pick it again."
+        if error:
+            self.report({'ERROR'}, error)
+            # cancel() is not called after a confirmed dialog; drop the half-done setup here
+            if self.pending_id:
+                cancel_setup(self.pending_id, self.report)
             return {'CANCELLED'}
 
-        CUSTOM_BONE_NAME = self.bone_name
-        self.report({'INFO'}, f"Selected bone: {CUSTOM_BONE_NAME}")
+        if not self.pending_id:
+            self.report({'INFO'}, f"Selected bone: {self.bone_name}")
+            return {'FINISHED'}
+
+        result = resume_setup(self.pending_id, self.bone_name, self.report, rig)
+        if result is None or result["status"] != 'OK':
+            return {'CANCELLED'}
+        self.report({'INFO'}, f"Lighting setup finished for '{result['collection']}' (bone: {self.bone_name}).")
         return {'FINISHED'}
 
+    def cancel(self, context):
+        # Dialog closed without confirming: drop the half-done setup
+        if self.pending_id:
+            cancel_setup(self.pending_id, self.report)
+
 
 def register():
     bpy.utils.register_class(LIGHTINGSETUP_OT_set_child_of_bone_popup)
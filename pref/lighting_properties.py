@@ -20,6 +20,24 @@ class LightingProperties(bpy.types.PropertyGroup):
         description="After making copies, remove any linked Light datablocks with zero users",
         default=True,
     )
+    per_object_light_copies: bpy.props.BoolProperty(
+        name="Per-Object Light Copies",
+        description=("Give every override light its own local Light named after its key value, "
+                     "instead of one shared copy per linked Light"),
+        default=False,
+    )
+    light_filter: bpy.props.StringProperty(
+        name="Filter",
+        description="Show only lights whose group suffix or name contains this text",
+        default="",
+        options={'TEXTEDIT_UPDATE'},
+    )
+    expanded_groups: bpy.props.StringProperty(
+        name="Expanded Groups",
+        description="JSON list of the suffixes of the light groups shown expanded in the panel",
+        default="",
+        options={'HIDDEN'},
+    )
 
 
 def register():
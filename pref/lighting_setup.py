@@ -11,6 +11,13 @@ class LIGHTINGSETUP(bpy.types.PropertyGroup):
         default="presets/blend/lighting_setup.blend",
         subtype='FILE_PATH'
     )
+    use_library_override: bpy.props.BoolProperty(
+        name="Link with Override",
+        description=("Link the lighting setup and create a library override per character instead of "
+                     "appending a full copy; light data is shared and only changed properties are stored. "
+                     "The blend file then depends on the preset file path"),
+        default=False,
+    )
 
 
 def register():
@@ -1,68 +1,33 @@
 import bpy
-from collections import defaultdict
+from ...utils.light_index import get_keyed_index, get_expanded_groups
+from ...utils.node_registry import NODE_CONTROLS, registry as node_registry
+from ...ops.LightingProperties.import_preset_async import get_active_import_job
 
 
 # ------------------------------------------------------------------------
 # Helpers
 # ------------------------------------------------------------------------
-def find_objects_by_key(key):
-    return [obj for obj in bpy.data.objects if key in obj.keys()]
-
-
-def get_compositor_tree(scene: bpy.types.Scene):
-    """Return the scene's compositor node tree, or None safely."""
-    if not scene:
-        return None
-    # In Blender 3.x/4.x, the compositor lives on the scene's node_tree
-    tree = getattr(scene, "node_tree", None)
-    return tree if tree and isinstance(tree, bpy.types.NodeTree) else None
-
-
-def find_custom_node(scene: bpy.types.Scene, node_name):
-    """Return the node with named if it exists."""
-    tree = get_compositor_tree(scene)
-    if not tree:
-        return None
-    return tree.nodes.get(node_name)
-
-
-def get_material_node_tree(mat: bpy.types.Material):
-    """Return the material's node tree, or None safely."""
-    if not mat:
-        return None
-    # In all modern Blender versions, materials can have node trees when use_nodes is True
-    if not getattr(mat, "use_nodes", False):
-        return None
-    tree = getattr(mat, "node_tree", None)
-    return tree if tree and isinstance(tree, bpy.types.NodeTree) else None
-
-
-def find_material_node(mat: bpy.types.Material, node_name: str):
-    """Return the node with the given name from the material's node tree, or None safely."""
-    tree = get_material_node_tree(mat)
-    if not tree:
-        return None
-    return tree.nodes.get(node_name)
-
-
-def get_thickness_socket(node: bpy.types.Node):
-    """
-    Return Occlusion_Thickness.inputs[0] exactly, or None if missing.
-    """
-    try:
-        # You said this is the canonical path; we'll respect it but still guard it.
-        node_exact = bpy.data.scenes["Scene"].node_tree.nodes.get("Occlusion_Thickness")
-        if node_exact and len(node_exact.inputs) > 0:
-            return node_exact.inputs[0]
-    except Exception:
-        pass
-    return None
-
-
-def _suffix_of(s: str) -> str:
-    if not s:
-        return ""
-    return s.rsplit('_', 1)[-1]  # after last underscore
+def _missing_node_text(control) -> str:
+    if control.material is None:
+        return f"Compositor node '{control.node}' not found."
+    return f"Material '{control.material}' node '{control.node}' not found."
+
+
+def _draw_node_control(layout, control, node):
+    """Draw one NODE_CONTROLS row for its resolved node."""
+    col = layout.column(align=True)
+    col.label(text=control.label)
+    if control.kind == 'RAMP':
+        layout.template_color_ramp(node, "color_ramp", expand=True)
+    elif control.kind == 'SOCKETS':
+        # Two sockets per row
+        for i in range(0, len(control.fields), 2):
+            row = layout.row(align=True)
+            for index, text in control.fields[i:i + 2]:
+                row.prop(node.inputs[index], "default_value", text=text)
+    elif control.kind == 'PROP':
+        for attr, text in control.fields:
+            col.prop(node, attr, text=text)
 
 
 # ------------------------------------------------------------------------
@@ -82,15 +47,42 @@ class LightingPropertiesUI:
 
         # row_func = layout.row(align=True)
         # row_func.operator("blp.make_override_lights_local", text="Override Light", icon="LIBRARY_DATA_OVERRIDE")
-        # make func to detect bpy.data.scenes["Scene"].node_tree.nodes["Occlusion_Thickness"] exists or not
 
         ## Export Import Preset
         box_preset = layout.box()
         row_preset = box_preset.row(align=True)
         row_preset.operator("blp.export_lighting_preset", text="Export Preset", icon="EXPORT")
         row_preset.operator("blp.import_lighting_preset", text="Import Preset", icon="IMPORT")
+        job = get_active_import_job()
+        if job is None:
+            box_preset.operator("blp.import_lighting_preset_async", text="Import Preset (Background)",
+                                icon="SORTTIME")
+        else:
+            row_job = box_preset.row(align=True)
+            if hasattr(row_job, "progress"):
+                row_job.progress(factor=job.progress, type='BAR',
+                                 text=f"Importing preset: {int(job.progress * 100)}%")
+            else:
+                row_job.label(text=f"Importing preset: {int(job.progress * 100)}%", icon='SORTTIME')
+            row_job.operator("blp.cancel_preset_import", text="", icon="CANCEL")
+        row_snapshot = box_preset.row(align=True)
+        row_snapshot.operator("blp.save_lighting_snapshot", text="Save Snapshot", icon="FILE_TICK")
+        row_snapshot.operator("blp.restore_lighting_snapshot", text="Restore Snapshot", icon="RECOVER_LAST")
+        row_snapshot.operator("blp.delete_lighting_snapshot", text="", icon="TRASH")
         col_override = box_preset.column(align=True)
         col_override.operator("blp.override_fog_materials", text="Override Fog Materials", icon="MATERIAL")
+        col_override.operator("blp.override_materials_batch", text="Batch Override Materials",
+                              icon="LIBRARY_DATA_OVERRIDE")
+
+        # Resolve every named node once; handles are cached until a node tree changes
+        handles = node_registry.handles(s)
+        sections = {}
+        for control in NODE_CONTROLS:
+            node = handles.get((control.material, control.node))
+            if not node:
+                occ_box.label(text=_missing_node_text(control), icon='ERROR')
+            else:
+                sections.setdefault(control.section, []).append((control, node))
 
         ## Ambient Occlusion
         box_ao = layout.box()
@@ -99,102 +91,67 @@ class LightingPropertiesUI:
         row_ao = box_ao.row(align=True)
         eevee = self.context.scene.eevee
         row_ao.prop(eevee, "gtao_distance", text="AO Distance")
-
-        col_ao_thic = box_ao.column(align=True)
-
-        ao_thic_node = find_custom_node(s, "Occlusion_Thickness")
-        if not ao_thic_node:
-            occ_box.label(text="Compositor node 'Occlusion_Thickness' not found.", icon='ERROR')
-        else:
-            col_ao_thic.label(text="AO Thickness Ramp:")
-            box_ao.template_color_ramp(ao_thic_node, "color_ramp", expand=True)
+        for control, node in sections.get('AO', []):
+            _draw_node_control(box_ao, control, node)
 
         # Mist
-        mist_controller_node = find_custom_node(s, "Mist_Controller")
-        if not mist_controller_node:
-            occ_box.label(text="Compositor node 'Mist_Controller' not found.", icon='ERROR')
-        else:
+        if 'MIST' in sections:
             box_mist = layout.box()
-            col_mist_controller = box_mist.column(align=True)
-
-            col_mist_controller.label(text="Mist Controller Ramp:")
-            box_mist.template_color_ramp(mist_controller_node, "color_ramp", expand=True)
+            for control, node in sections['MIST']:
+                _draw_node_control(box_mist, control, node)
 
-        box_dof = layout.box()
         # Depth of Field
-        dof_range_node = find_custom_node(s, "Dof_Range")
-        if not dof_range_node:
-            occ_box.label(text="Compositor node 'Dof_Range' not found.", icon='ERROR')
-        else:
-            col_dof_range = box_dof.column(align=True)
-            row_dof_range_1 = box_dof.row(align=True)
-            row_dof_range_2 = box_dof.row(align=True)
-
-            col_dof_range.label(text="DOF Range:")
-            row_dof_range_1.prop(dof_range_node.inputs[1], "default_value", text="From Min")
-            row_dof_range_1.prop(dof_range_node.inputs[2], "default_value", text="From Max")
-            row_dof_range_2.prop(dof_range_node.inputs[3], "default_value", text="To Min")
-            row_dof_range_2.prop(dof_range_node.inputs[4], "default_value", text="To Max")
-
-        col_dof_intensity = box_dof.column(align=True)
-
-        dof_intensity_node = find_custom_node(s, "Dof_Intensity")
-        if not dof_intensity_node:
-            occ_box.label(text="Compositor node 'Dof_Intensity' not found.", icon='ERROR')
-        else:
-            col_dof_intensity.label(text="DOF Intensity Ramp:")
-            box_dof.template_color_ramp(dof_intensity_node, "color_ramp", expand=True)
-
-        col_defocus_zscale = box_dof.column(align=True)
-
-        defocus_zscale_node = find_custom_node(s, "Defocus")
-        if not defocus_zscale_node:
-            occ_box.label(text="Compositor node 'Defocus' not found.", icon='ERROR')
-        else:
-            col_defocus_zscale.label(text="Defocus Z-Scale:")
-            col_defocus_zscale.prop(defocus_zscale_node, "z_scale", text="Z-Scale")
+        box_dof = layout.box()
+        for control, node in sections.get('DOF', []):
+            _draw_node_control(box_dof, control, node)
 
         # Underwater Fog
-        fog_mat = bpy.data.materials.get("Fog")
-        uf_color = find_material_node(fog_mat, "Underwater_Fog_Color")
-        if not uf_color:
-            occ_box.label(text="Compositor node 'Underwater_Fog_Color' not found.", icon='ERROR')
-        else:
+        if 'FOG' in sections:
             box_water_fog = layout.box()
             col_water_fog = box_water_fog.column(align=True)
 
             col_water_fog.label(text="Underwater Fog Range:")
             col_water_fog.prop(eevee, "volumetric_start", text="Fog Range Start")
-
-            col_water_fog.label(text="Underwater Fog Color Ramp:")
-            box_water_fog.template_color_ramp(uf_color, "color_ramp", expand=True)
+            for control, node in sections['FOG']:
+                _draw_node_control(box_water_fog, control, node)
 
         # Light Properties
         key = props.key
-        objs = sorted(find_objects_by_key(key), key=lambda o: o.name.lower())
-
-        layout.label(text=f"Found: {len(objs)}")
+        # Cached per scene and kept current by depsgraph handlers; no full object scan per redraw.
+        index = get_keyed_index(s, key) if key else None
+        groups = index.groups(props.light_filter) if index else []
+        expanded = get_expanded_groups(props)
+        filtering = bool(props.light_filter.strip())
+
+        row_found = layout.row(align=True)
+        row_found.label(text=f"Found: {sum(len(rows) for _suffix, rows in groups)}")
+        op_all = row_found.operator("blp.toggle_light_group", text="",
+                                    icon='FULLSCREEN_EXIT' if expanded else 'FULLSCREEN_ENTER')
+        op_all.toggle_all = True
+        layout.prop(props, "light_filter", text="", icon='VIEWZOOM')
         col = layout.column(align=True)
-        if not objs:
+        if not groups:
             col.label(text="No objects with that key.", icon='INFO')
         else:
-            # 1) bucket objects by suffix
-            buckets = defaultdict(list)
-            for o in objs:
-                value = o.get(key)
-                buckets[_suffix_of(value)].append(o)
-
-            # 2) deterministically order the suffixes (optional but nice)
-            for suffix in sorted(buckets.keys()):
-                items = buckets[suffix]
-
-                # One box per suffix
+            # Groups come bucketed by suffix and sorted by the index
+            for suffix, rows in groups:
+                # One box per suffix; collapsed groups only draw a summary row
                 box = layout.box()
-                box.label(text=f"Group: {suffix}", icon='LIGHT_DATA')
+                is_open = filtering or suffix in expanded
+                row_header = box.row(align=True)
+                op = row_header.operator("blp.toggle_light_group", text=f"Group: {suffix}",
+                                         icon='DISCLOSURE_TRI_DOWN' if is_open else 'DISCLOSURE_TRI_RIGHT',
+                                         emboss=False)
+                op.suffix = suffix
+                row_header.label(text=f"{len(rows)}", icon='LIGHT_DATA')
+                if not is_open:
+                    continue
 
                 # A column to stack per-object controls
                 col = box.column(align=True)
 
+                # Only expanded rows are turned back into objects
+                items = index.resolve(rows)
                 for o in items:
                     value = o.get(key) or "(unnamed)"
                     name_l = value.lower()
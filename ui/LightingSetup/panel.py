@@ -12,4 +12,6 @@ class LightingSetupUI:
 
         row_func = layout.row(align=True)
         row_func.operator("bls.append_blend", text="Append Setup", icon="IMPORT")
+        row_func.operator("bls.batch_append_blend", text="Batch Setup", icon="COMMUNITY")
+        layout.prop(props, "use_library_override")
 
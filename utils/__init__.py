@@ -0,0 +1,16 @@
+from . import (batch_rename, handlers, hierarchy_index, id_journal, instancer_index, light_index, localize,
+               node_registry, override_index, rig_index, template_cache)
+
+modules = [
+    handlers,
+]
+
+
+def register():
+    for item in modules:
+        item.register()
+
+
+def unregister():
+    for item in modules:
+        item.unregister()
@@ -0,0 +1,109 @@
+import re
+
+# Blender's duplicate tail: 'name.001'
+NUMERIC_TAIL = re.compile(r"^(.*?)\.(\d{3,})$")
+
+
+# ------------------------------------------------------------------------
+# Name Rules
+# ------------------------------------------------------------------------
+class SuffixRule:
+    """
+    Insert _<suffix> before any numeric .### tail: 'l-fill' -> 'l-fill_napo', 'l-fill.001' -> 'l-fill_napo.001'.
+    Names that already carry _<suffix> (with or without a numeric tail) are left unchanged.
+    The patterns are compiled once per rule, not once per name.
+    """
+
+    def __init__(self, suffix: str):
+        self.suffix = suffix
+        self.tail = f"_{suffix}"
+        self._suffixed = re.compile(rf"_{re.escape(suffix)}(?:\.\d{{3,}})?$")
+
+    def __call__(self, name: str) -> str:
+        if self._suffixed.search(name):
+            return name
+        m = NUMERIC_TAIL.match(name)
+        if m:
+            core, num = m.groups()
+            return f"{core}{self.tail}.{num}"
+        return f"{name}{self.tail}"
+
+
+# ------------------------------------------------------------------------
+# Batch Rename
+# ------------------------------------------------------------------------
+class RenamePlan:
+    """
+    Renames for a batch of IDs, resolved against a snapshot of the names already taken, so
+    every target name is known to be free before anything is renamed:
+      renames:   (id, old name, new name) in input order
+      collided:  (old name, wanted name) pairs that got a '.###' tail because the wanted name was taken
+
+    Names are only reserved, never released: an ID's old name is not reused by another ID in the
+    same plan, so the result does not depend on the order the renames are applied in.
+    """
+
+    def __init__(self, taken):
+        self.taken = set(taken)
+        self.renames = []
+        self.collided = []
+        self._next_tail = {}  # base name -> next '.###' number to try
+
+    def __len__(self):
+        return len(self.renames)
+
+    def _free_name(self, wanted: str) -> str:
+        if wanted not in self.taken:
+            return wanted
+        m = NUMERIC_TAIL.match(wanted)
+        base = m.group(1) if m else wanted
+        n = self._next_tail.get(base, 1)
+        while f"{base}.{n:03d}" in self.taken:
+            n += 1
+        self._next_tail[base] = n + 1
+        return f"{base}.{n:03d}"
+
+    def add(self, id_, wanted: str):
+        """Plan renaming 'id_' to 'wanted', or to the next free 'wanted.###'. Returns the planned name."""
+        old = id_.name
+        if wanted == old:
+            return old
+        new = self._free_name(wanted)
+        if new != wanted:
+            self.collided.append((old, wanted))
+        self.taken.add(new)
+        self.renames.append((id_, old, new))
+        return new
+
+    def apply(self, key: str | None = None) -> list[tuple[str, str]]:
+        """
+        Rename every planned ID in one pass and store the final name in the 'key' custom property.
+        Returns (old, new) pairs for the IDs that were renamed; failures are printed and skipped.
+        """
+        done = []
+        for id_, old, new in self.renames:
+            try:
+                id_.name = new
+            except Exception as e:
+                print(f"Could not rename '{old}' to '{new}': {e}")
+                continue
+            if id_.name != new:
+                # Blender clipped the name (length limit); keep the actual one
+                print(f"'{old}' was renamed to '{id_.name}' instead of '{new}'.")
+            if key:
+                id_[key] = id_.name
+            done.append((old, id_.name))
+        return done
+
+
+def plan_renames(ids, rule, taken) -> RenamePlan:
+    """Plan rule(name) for each of 'ids' against the names in 'taken' (e.g. the names of bpy.data.objects)."""
+    plan = RenamePlan(taken)
+    for id_ in ids:
+        plan.add(id_, rule(id_.name))
+    return plan
+
+
+def local_names(id_collection) -> set[str]:
+    """Names of the local IDs in a bpy.data collection; linked IDs live in their library's namespace."""
+    return {i.name for i in id_collection if i.library is None}
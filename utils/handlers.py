@@ -0,0 +1,85 @@
+import bpy
+from bpy.app.handlers import persistent
+
+
+# ------------------------------------------------------------------------
+# Cache Handlers
+# ------------------------------------------------------------------------
+# Caches in utils/ subscribe here instead of appending their own handlers, so
+# each depsgraph update is dispatched from a single persistent function.
+_depsgraph_callbacks = []
+_reset_callbacks = []
+_save_callbacks = []
+
+
+def on_depsgraph_update(callback):
+    """Register callback(scene, depsgraph) to run after every depsgraph update."""
+    if callback not in _depsgraph_callbacks:
+        _depsgraph_callbacks.append(callback)
+    return callback
+
+
+def on_reset(callback):
+    """Register callback() to run whenever bpy.data is reloaded (file load, undo, redo)."""
+    if callback not in _reset_callbacks:
+        _reset_callbacks.append(callback)
+    return callback
+
+
+def on_save_pre(callback):
+    """Register callback() to run right before the blend file is saved."""
+    if callback not in _save_callbacks:
+        _save_callbacks.append(callback)
+    return callback
+
+
+@persistent
+def _depsgraph_update_post(scene, depsgraph):
+    for callback in _depsgraph_callbacks:
+        try:
+            callback(scene, depsgraph)
+        except Exception as e:
+            print(f"Cache update failed in {callback.__name__}: {e}")
+
+
+@persistent
+def _data_reset(*_args):
+    for callback in _reset_callbacks:
+        try:
+            callback()
+        except Exception as e:
+            print(f"Cache reset failed in {callback.__name__}: {e}")
+
+
+@persistent
+def _save_pre(*_args):
+    for callback in _save_callbacks:
+        try:
+            callback()
+        except Exception as e:
+            print(f"Pre-save cleanup failed in {callback.__name__}: {e}")
+
+
+_HANDLERS = (
+    (bpy.app.handlers.depsgraph_update_post, _depsgraph_update_post),
+    (bpy.app.handlers.load_post, _data_reset),
+    (bpy.app.handlers.undo_post, _data_reset),
+    (bpy.app.handlers.redo_post, _data_reset),
+    (bpy.app.handlers.save_pre, _save_pre),
+)
+
+
+# ------------------------------------------------------------------------
+# Register
+# ------------------------------------------------------------------------
+def register():
+    for handler_list, fn in _HANDLERS:
+        if fn not in handler_list:
+            handler_list.append(fn)
+
+
+def unregister():
+    for handler_list, fn in _HANDLERS:
+        if fn in handler_list:
+            handler_list.remove(fn)
+    _data_reset()
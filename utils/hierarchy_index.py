@@ -0,0 +1,106 @@
+from collections import deque
+
+# No bpy import: the index only needs .children / .objects / .instance_collection,
+# so it also works on stand-in trees (see benchmarks/bench_hierarchy_index.py).
+
+
+# ------------------------------------------------------------------------
+# Collection Hierarchy Index
+# ------------------------------------------------------------------------
+class HierarchyIndex:
+    """
+    Parent/path lookups for a collection tree, built in one breadth-first pass.
+
+      parents:  collection -> [parent collections]   (a collection may be linked in several places)
+      depth:    collection -> shortest distance from a root
+      objects:  object -> [collections that directly contain it]
+      instancers: collection -> [objects instancing it] (only with follow_instances=True)
+
+    Every collection is visited once, so multi-parent links and instancing cycles
+    (A instances B, B instances A) terminate. The index is a snapshot: build it at the
+    start of an operator run and call rebuild() after linking/unlinking collections.
+    """
+
+    def __init__(self, roots, follow_instances=False):
+        self.roots = list(roots)
+        self.follow_instances = follow_instances
+        self.parents = {}
+        self.depth = {}
+        self.objects = {}
+        self.instancers = {}
+        self.rebuild()
+
+    def rebuild(self):
+        self.parents.clear()
+        self.depth.clear()
+        self.objects.clear()
+        self.instancers.clear()
+
+        queue = deque()
+        for root in self.roots:
+            if root is not None and root not in self.depth:
+                self.depth[root] = 0
+                self.parents[root] = []
+                queue.append(root)
+
+        while queue:
+            col = queue.popleft()
+            level = self.depth[col] + 1
+            for child in col.children:
+                self.parents.setdefault(child, []).append(col)
+                if child not in self.depth:
+                    self.depth[child] = level
+                    queue.append(child)
+            for obj in col.objects:
+                self.objects.setdefault(obj, []).append(col)
+                if not self.follow_instances:
+                    continue
+                inst = getattr(obj, "instance_collection", None)
+                if inst is None or getattr(obj, "instance_type", 'COLLECTION') != 'COLLECTION':
+                    continue
+                self.instancers.setdefault(inst, []).append(obj)
+                if inst not in self.depth:
+                    self.depth[inst] = level
+                    self.parents.setdefault(inst, [])
+                    queue.append(inst)
+        return self
+
+    # --------------------------------------------------------------------
+    # Queries
+    # --------------------------------------------------------------------
+    def __contains__(self, col):
+        return col in self.depth
+
+    def parents_of(self, col):
+        """Every collection that links 'col' as a child."""
+        return list(self.parents.get(col, ()))
+
+    def holder(self, col):
+        """The parent closest to a root, or None for roots and unknown collections."""
+        parents = self.parents.get(col)
+        if not parents:
+            return None
+        return min(parents, key=self.depth.__getitem__)
+
+    def path(self, target):
+        """Shortest ancestry path [root ... target], or [] if 'target' is not reachable through children."""
+        if target not in self.depth:
+            return []
+        path = [target]
+        col = target
+        while self.depth[col]:
+            parent = self.holder(col)
+            if parent is None or self.depth[parent] >= self.depth[col]:
+                # Reached only through an instancer; no parent chain to a root
+                return []
+            col = parent
+            path.append(col)
+        path.reverse()
+        return path
+
+    def collections_with(self, obj):
+        """Collections that directly contain 'obj', in traversal order (closest to a root first)."""
+        return list(self.objects.get(obj, ()))
+
+    def depth_of(self, col):
+        return self.depth.get(col)
@@ -0,0 +1,73 @@
+import bpy
+
+
+# ------------------------------------------------------------------------
+# ID Journal
+# ------------------------------------------------------------------------
+class IDJournal:
+    """
+    Record of what one setup step created or changed, so a failure can be undone without
+    leaving orphan data behind:
+      created: IDs the step made (collections, objects, their data, receiver collections, ...)
+      links:   (parent, child) collection links added to pre-existing collections
+
+    rollback() undoes the links in reverse order, then removes every created ID
+    in a single bpy.data.batch_remove call. Only valid within the operator run that filled it.
+    """
+
+    def __init__(self):
+        self.created = {}  # ID pointer -> ID
+        self.links = []
+
+    def __len__(self):
+        return len(self.created)
+
+    def record_created(self, *ids):
+        for id_ in ids:
+            if id_ is not None:
+                self.created.setdefault(id_.as_pointer(), id_)
+
+    def record_tree(self, root):
+        """Record a created collection tree: its collections, objects and their local/override data."""
+        stack = [root]
+        while stack:
+            coll = stack.pop()
+            if coll.as_pointer() in self.created:
+                continue
+            self.record_created(coll)
+            for obj in coll.objects:
+                self.record_created(obj)
+                data = obj.data
+                if data is not None and data.library is None:
+                    self.record_created(data)
+            stack.extend(coll.children)
+
+    def link_child(self, parent, child):
+        """Link 'child' under 'parent' and remember to unlink it on rollback."""
+        parent.children.link(child)
+        self.links.append((parent, child))
+
+    def _is_created(self, struct):
+        id_data = getattr(struct, "id_data", None)
+        return id_data is not None and id_data.as_pointer() in self.created
+
+    def rollback(self) -> int:
+        """Undo everything recorded; returns the number of IDs removed."""
+        for parent, child in reversed(self.links):
+            if self._is_created(parent) or self._is_created(child):
+                continue
+            try:
+                parent.children.unlink(child)
+            except RuntimeError as e:
+                print(f"Rollback could not unlink '{child.name}' from '{parent.name}': {e}")
+
+        ids = list(self.created.values())
+        if ids:
+            bpy.data.batch_remove(ids)
+        self.commit()
+        return len(ids)
+
+    def commit(self):
+        """Forget the record; the recorded changes stay."""
+        self.created.clear()
+        self.links.clear()
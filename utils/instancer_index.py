@@ -0,0 +1,119 @@
+import bpy
+from . import handlers
+from .light_index import object_ref
+
+
+def base_name(name: str) -> str:
+    """Object name without Blender's '.###' duplicate suffix."""
+    return name.split(".", 1)[0]
+
+
+def collection_ref(coll):
+    """Return a (name, library path) pair that bpy.data.collections.get() resolves back to coll."""
+    return coll.name, (coll.library.filepath if coll.library else None)
+
+
+# ------------------------------------------------------------------------
+# Instancer Index
+# ------------------------------------------------------------------------
+class InstancerIndex:
+    """
+    Object name -> [(instancer empty, instanced collection)] for every collection instancer.
+
+    Answers "which instancer brings in object X" with one dict lookup. Names are indexed both
+    in full and with the '.###' suffix stripped. Each instanced collection's all_objects is
+    walked once per build, however many empties instance it. Entries hold name refs and are
+    resolved (and dropped if gone) when read.
+    """
+
+    def __init__(self):
+        self.by_name = {}  # object name / base name -> [(instancer ref, collection ref)]
+        self.stale = True
+        self.object_count = -1
+
+    def rebuild(self):
+        self.by_name.clear()
+        names_per_collection = {}  # collection pointer -> names of its objects (full and base)
+        for obj in bpy.data.objects:
+            if obj.type != 'EMPTY' or getattr(obj, "instance_type", None) != 'COLLECTION':
+                continue
+            coll = getattr(obj, "instance_collection", None)
+            if not coll:
+                continue
+            key = coll.as_pointer()
+            names = names_per_collection.get(key)
+            if names is None:
+                names = names_per_collection[key] = self._collection_names(coll)
+            pair = (object_ref(obj), collection_ref(coll))
+            for name in names:
+                self.by_name.setdefault(name, []).append(pair)
+        self.object_count = len(bpy.data.objects)
+        self.stale = False
+
+    @staticmethod
+    def _collection_names(coll):
+        names = []
+        seen = set()
+        # all_objects includes nested children if available
+        for o in getattr(coll, "all_objects", coll.objects):
+            if not o:
+                continue
+            for name in (o.name, base_name(o.name)):
+                if name not in seen:
+                    seen.add(name)
+                    names.append(name)
+        return names
+
+    def ensure(self):
+        """Rebuild if marked stale or objects were added/removed since the last build."""
+        if self.stale or self.object_count != len(bpy.data.objects):
+            self.rebuild()
+        return self
+
+    def find(self, name: str):
+        """Return [(instancer, collection)] whose collection holds an object named (or based on) 'name'."""
+        pairs = []
+        for inst_ref, coll_ref in self.by_name.get(name, ()):
+            inst = bpy.data.objects.get(inst_ref)
+            coll = bpy.data.collections.get(coll_ref)
+            if inst is None or coll is None or inst.instance_collection != coll:
+                # Removed, renamed or re-pointed since the build; the next build picks up the new state
+                self.stale = True
+                continue
+            pairs.append((inst, coll))
+        return pairs
+
+
+_index = InstancerIndex()
+
+
+def get_instancer_index() -> InstancerIndex:
+    """Return the shared, up-to-date instancer index."""
+    return _index.ensure()
+
+
+def find_instancers(name: str):
+    """[(instancer empty, instanced collection)] that bring in an object named (or based on) 'name'."""
+    return get_instancer_index().find(name)
+
+
+def invalidate():
+    """Force a rebuild on next access, e.g. after an operator created overrides mid-run."""
+    _index.stale = True
+
+
+@handlers.on_depsgraph_update
+def _on_depsgraph_update(scene, depsgraph):
+    if _index.stale:
+        return
+    for update in depsgraph.updates:
+        id_ = update.id
+        # Membership changes show up as Collection updates, re-pointed instancers as EMPTY updates
+        if isinstance(id_, bpy.types.Collection) or (isinstance(id_, bpy.types.Object) and id_.type == 'EMPTY'):
+            _index.stale = True
+            return
+
+
+@handlers.on_reset
+def _on_reset():
+    invalidate()
@@ -0,0 +1,186 @@
+import bpy
+import json
+from bisect import insort
+from . import handlers
+
+
+# ------------------------------------------------------------------------
+# Helpers
+# ------------------------------------------------------------------------
+def suffix_of(value) -> str:
+    """Return the part of a key value after its last underscore."""
+    if not value:
+        return ""
+    return str(value).rsplit('_', 1)[-1]
+
+
+def object_ref(obj):
+    """Return a (name, library path) pair that bpy.data.objects.get() resolves back to obj."""
+    return obj.name, (obj.library.filepath if obj.library else None)
+
+
+def get_expanded_groups(props) -> set[str]:
+    """Return the set of suffixes whose light group is expanded in the panel."""
+    raw = props.expanded_groups
+    if not raw:
+        return set()
+    try:
+        # A JSON list, so suffixes may contain any character; "" is the group of keys ending in '_'
+        groups = json.loads(raw)
+    except ValueError:
+        return set()
+    if not isinstance(groups, list):
+        return set()
+    return {s for s in groups if isinstance(s, str)}
+
+
+def set_expanded_groups(props, suffixes):
+    props.expanded_groups = json.dumps(sorted(suffixes), ensure_ascii=False) if suffixes else ""
+
+
+# ------------------------------------------------------------------------
+# Keyed Object Index
+# ------------------------------------------------------------------------
+class KeyedObjectIndex:
+    """
+    Index of the objects in a scene that carry a custom property key, bucketed by key suffix.
+    Entries hold object references by name, so the index survives deletions and renames and
+    is revalidated lazily when it is read.
+    """
+
+    def __init__(self, key: str):
+        self.key = key
+        self.entries = {}  # ref -> (value, suffix)
+        self.buckets = {}  # suffix -> sorted [(name_lower, name_full, value_lower, ref)]
+        self.stale = True
+        self.object_count = -1
+
+    def rebuild(self, scene):
+        key = self.key
+        self.entries.clear()
+        self.buckets.clear()
+        for obj in scene.objects:
+            if key in obj:
+                self._insert(obj)
+        self.object_count = len(bpy.data.objects)
+        self.stale = False
+
+    def update_object(self, obj):
+        """Re-index a single object after it changed."""
+        ref = object_ref(obj)
+        self._discard(ref)
+        if self.key in obj:
+            self._insert(obj)
+
+    def ensure(self, scene):
+        """Rebuild if marked stale or objects were added/removed since the last build."""
+        if self.stale or self.object_count != len(bpy.data.objects):
+            self.rebuild(scene)
+        return self
+
+    def groups(self, text: str = ""):
+        """
+        Return [(suffix, rows)] in display order without touching any object.
+        With `text`, keep only rows whose suffix, key value or name contains it (case-insensitive).
+        """
+        needle = text.strip().lower()
+        groups = []
+        for suffix in sorted(self.buckets.keys()):
+            rows = self.buckets[suffix]
+            if needle and needle not in suffix.lower():
+                rows = [row for row in rows if needle in row[2] or needle in row[0]]
+            if rows:
+                groups.append((suffix, rows))
+        return groups
+
+    def objects(self):
+        """Return all indexed objects sorted by lowercase name."""
+        rows = sorted(row for bucket in self.buckets.values() for row in bucket)
+        return self.resolve(rows)
+
+    def resolve(self, rows):
+        """Turn index rows back into objects, dropping rows whose object is gone."""
+        objs = []
+        dropped = []
+        for _name_lower, _name_full, _value_lower, ref in rows:
+            obj = bpy.data.objects.get(ref)
+            if obj is None or self.key not in obj:
+                # Deleted or renamed since it was indexed; the rename shows up as a new entry.
+                dropped.append(ref)
+                continue
+            objs.append(obj)
+        for ref in dropped:
+            self._discard(ref)
+        return objs
+
+    def _insert(self, obj):
+        value = obj.get(self.key)
+        suffix = suffix_of(value)
+        ref = object_ref(obj)
+        self.entries[ref] = (value, suffix)
+        # Lowercase name/value are precomputed here so filtering never reads RNA
+        # name_full is unique, so sorting never has to compare refs
+        row = (obj.name.lower(), obj.name_full, str(value).lower() if value is not None else "", ref)
+        insort(self.buckets.setdefault(suffix, []), row)
+
+    def _discard(self, ref):
+        entry = self.entries.pop(ref, None)
+        if entry is None:
+            return
+        suffix = entry[1]
+        bucket = self.buckets.get(suffix, [])
+        bucket[:] = [row for row in bucket if row[3] != ref]
+        if not bucket:
+            self.buckets.pop(suffix, None)
+
+
+# ------------------------------------------------------------------------
+# Per-Scene Cache
+# ------------------------------------------------------------------------
+_indices = {}  # (scene name, key) -> KeyedObjectIndex
+
+
+def get_keyed_index(scene, key: str) -> KeyedObjectIndex:
+    """Return the up-to-date index of objects carrying `key` in `scene`."""
+    index = _indices.get((scene.name_full, key))
+    if index is None:
+        index = _indices[(scene.name_full, key)] = KeyedObjectIndex(key)
+    return index.ensure(scene)
+
+
+def find_objects_by_key(key: str, scene=None):
+    """All objects in the scene that have the given custom property key, sorted by name."""
+    if not key:
+        return []
+    scene = scene or bpy.context.scene
+    return get_keyed_index(scene, key).objects()
+
+
+def invalidate(scene=None):
+    """Force a rebuild on next access, for one scene or all of them."""
+    for (scene_name, _key), index in _indices.items():
+        if scene is None or scene_name == scene.name_full:
+            index.stale = True
+
+
+@handlers.on_depsgraph_update
+def _on_depsgraph_update(scene, depsgraph):
+    scene_indices = [index for (scene_name, _key), index in _indices.items()
+                     if scene_name == scene.name_full and not index.stale]
+    if not scene_indices:
+        return
+    for update in depsgraph.updates:
+        id_ = update.id
+        if isinstance(id_, bpy.types.Object):
+            obj = id_.original
+            for index in scene_indices:
+                index.update_object(obj)
+        elif isinstance(id_, bpy.types.Collection):
+            # Objects were linked/unlinked somewhere; membership is cheaper to rebuild lazily.
+            for index in scene_indices:
+                index.stale = True
+
+
+@handlers.on_reset
+def _on_reset():
+    _indices.clear()
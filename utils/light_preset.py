@@ -0,0 +1,506 @@
+import bpy
+import json
+import numpy as np
+from .json_manager import JSONManager
+from .npz_manager import NPZManager
+
+# Fields every preset has carried since the first format, and the values the import
+# falls back to when an item lacks them. Any other missing field keeps the light's current value.
+LEGACY_DEFAULTS = {
+    "color": (1.0, 1.0, 1.0),
+    "energy": 10.0,
+    "exposure": 0.0,
+    "shadow_jitter_overblur": 0.0,
+}
+
+NO_COLLECTION = "NoCollection"
+
+# Preset file formats, picked by extension: JSON for interchange, NPZ for large libraries/farm jobs
+PRESET_EXTENSIONS = (".json", ".npz")
+NPZ_FORMAT_VERSION = 3
+# .npz entries that are not field columns
+NPZ_TABLE_KEYS = ("version", "names", "collections", "types", "extras")
+
+# RNA structs per Light.type; properties they add on top of bpy.types.Light are per-type fields
+LIGHT_TYPE_STRUCTS = {
+    'POINT': "PointLight",
+    'SPOT': "SpotLight",
+    'AREA': "AreaLight",
+    'SUN': "SunLight",
+}
+# Never part of a preset: changing the type would swap the struct under the other fields
+SCHEMA_SKIP = {"rna_type", "type"}
+# Defined on every light subtype rather than on bpy.types.Light. foreach_get/set over bpy.data.lights
+# looks the property up on each item's own subtype, so a property every subtype defines can be batched;
+# one that only some subtypes have (spot_size, shape, ...) cannot, and stays a per-type field.
+# Builds whose foreach rejects subtype properties are handled by the per-light fallback below.
+SUBTYPE_COLUMNS = ("energy",)
+# Kinds written as batched columns. foreach_set bypasses RNA update callbacks, which toggles such as
+# use_nodes (creates the node tree) or use_shadow/use_contact_shadow rely on, so booleans and enums
+# are set per light with setattr instead
+COLUMN_KINDS = ('FLOAT', 'INT')
+
+_NUMERIC_DTYPES = {'FLOAT': np.float32, 'INT': np.int32, 'BOOLEAN': bool}
+_PY_TYPES = {'FLOAT': float, 'INT': int, 'BOOLEAN': bool, 'ENUM': str}
+
+
+# ------------------------------------------------------------------------
+# Schema
+# ------------------------------------------------------------------------
+_schema_cache = {}
+
+
+def _struct_fields(struct):
+    """(attr, components, kind) for every writable numeric/enum property of an RNA struct."""
+    id_props = set(bpy.types.ID.bl_rna.properties.keys())
+    fields = []
+    for prop in struct.bl_rna.properties:
+        attr = prop.identifier
+        if attr in SCHEMA_SKIP or attr in id_props or prop.is_readonly:
+            continue
+        if prop.type in _NUMERIC_DTYPES:
+            fields.append((attr, max(1, prop.array_length), prop.type))
+        elif prop.type == 'ENUM' and not prop.is_enum_flag:
+            fields.append((attr, 1, 'ENUM'))
+    return tuple(fields)
+
+
+def _subtype_columns():
+    """SUBTYPE_COLUMNS fields, (attr, components, kind), that every light subtype of this build defines."""
+    per_type = [dict((f[0], f) for f in _struct_fields(getattr(bpy.types, name)))
+                for name in LIGHT_TYPE_STRUCTS.values() if hasattr(bpy.types, name)]
+    fields = []
+    for attr in SUBTYPE_COLUMNS:
+        found = {fields_of.get(attr) for fields_of in per_type}
+        if len(found) == 1 and None not in found:
+            fields.append(found.pop())
+    return tuple(f for f in fields if f[2] != 'ENUM')
+
+
+def light_schema(light_type=None):
+    """
+    Preset schema generated from bl_rna.properties, computed once per light type.
+    light_type=None: plain float/int fields shared by every Light (plus SUBTYPE_COLUMNS),
+    read/written in batch with foreach_get/set.
+    A type ('POINT', 'SPOT', ...): fields only that type has, plus the shared booleans and enums,
+    handled per light so their RNA updates run.
+    """
+    if light_type in _schema_cache:
+        return _schema_cache[light_type]
+
+    shared = _struct_fields(bpy.types.Light)
+    shared_attrs = {f[0] for f in shared}
+    shared += tuple(f for f in _subtype_columns() if f[0] not in shared_attrs)
+    if light_type is None:
+        schema = tuple(f for f in shared if f[2] in COLUMN_KINDS)
+    else:
+        struct = getattr(bpy.types, LIGHT_TYPE_STRUCTS.get(light_type, ""), None)
+        shared_attrs = {f[0] for f in shared}
+        own = _struct_fields(struct) if struct else ()
+        schema = (tuple(f for f in shared if f[2] not in COLUMN_KINDS)
+                  + tuple(f for f in own if f[0] not in shared_attrs))
+
+    _schema_cache[light_type] = schema
+    return schema
+
+
+def available_fields():
+    """Batched (attr, components, kind) fields of this Blender build; pass to worker-thread parsing."""
+    return light_schema(None)
+
+
+# ------------------------------------------------------------------------
+# Helpers
+# ------------------------------------------------------------------------
+def session_uids(collection) -> np.ndarray:
+    """Return the session_uid of every ID in a bpy_prop_collection, in collection order."""
+    uids = np.empty(len(collection), dtype=np.int32)
+    if len(uids):
+        collection.foreach_get("session_uid", uids)
+    return uids
+
+
+def read_light_columns(fields=None):
+    """Read `fields` for every Light datablock with one foreach_get per field, as float64 columns."""
+    lights = bpy.data.lights
+    count = len(lights)
+    columns = {}
+    for attr, size, kind in (fields or available_fields()):
+        buf = np.empty(count * size, dtype=_NUMERIC_DTYPES[kind])
+        if count:
+            try:
+                lights.foreach_get(attr, buf)
+            except (AttributeError, TypeError, RuntimeError):
+                if attr not in SUBTYPE_COLUMNS:
+                    raise
+                buf[:] = np.ravel([getattr(light, attr) for light in lights])
+        columns[attr] = buf.reshape(count, size).astype(np.float64)
+    return columns
+
+
+def write_light_column(attr, kind, values):
+    """Write a full (lights, components) column back with a single foreach_set."""
+    values = values.astype(_NUMERIC_DTYPES[kind])
+    try:
+        bpy.data.lights.foreach_set(attr, values.ravel())
+    except (AttributeError, TypeError, RuntimeError):
+        if attr not in SUBTYPE_COLUMNS:
+            raise
+        for light, value in zip(bpy.data.lights, values.tolist()):
+            setattr(light, attr, value[0] if len(value) == 1 else value)
+
+
+def light_rows_for_objects(objs) -> np.ndarray:
+    """Return each object's Light datablock position inside bpy.data.lights."""
+    positions = {uid: i for i, uid in enumerate(session_uids(bpy.data.lights).tolist())}
+    return np.fromiter((positions[o.data.session_uid] for o in objs), dtype=np.int64, count=len(objs))
+
+
+def first_collection_names(objs):
+    """
+    Return the name of each object's first users_collection, or NO_COLLECTION.
+    Scans every collection once instead of asking each object for users_collection,
+    which walks all collections again per object.
+    """
+    wanted = {o.session_uid: i for i, o in enumerate(objs)}
+    names = [None] * len(objs)
+    remaining = len(wanted)
+
+    holders = list(bpy.data.collections) + [sc.collection for sc in bpy.data.scenes]
+    for coll in holders:
+        if not remaining:
+            break
+        members = coll.objects
+        if not len(members):
+            continue
+        for uid in session_uids(members).tolist():
+            i = wanted.get(uid)
+            if i is not None and names[i] is None:
+                names[i] = coll.name
+                remaining -= 1
+
+    return [name or NO_COLLECTION for name in names]
+
+
+def to_python(value, size, kind):
+    """Convert an RNA value or a column row into a JSON-friendly Python value."""
+    cast = _PY_TYPES[kind]
+    if size > 1:
+        return [cast(v) for v in value]
+    if isinstance(value, (list, tuple, np.ndarray)):
+        value = value[0]
+    return cast(value)
+
+
+def read_per_type_fields(light):
+    """Read the per-type fields of one Light datablock using the cached schema."""
+    return {attr: to_python(getattr(light, attr), size, kind)
+            for attr, size, kind in light_schema(light.type)}
+
+
+def _values_differ(current, wanted, kind):
+    if kind == 'FLOAT':
+        # Compare at the float32 precision RNA stores
+        return bool((np.asarray(current, dtype=np.float32) != np.asarray(wanted, dtype=np.float32)).any())
+    return current != wanted
+
+
+# ------------------------------------------------------------------------
+# Light Preset Table
+# ------------------------------------------------------------------------
+class LightPresetTable:
+    """
+    Columnar lighting preset: one row per light object.
+      columns: shared numeric fields, attr -> float64 (rows, components); NaN keeps the current value
+      types:   Light.type per row ("" for presets saved before types were recorded)
+      extras:  per-row dict of per-type fields (spot size, area shape, ...)
+    """
+
+    def __init__(self, names, collections, fields, columns, types=None, extras=None):
+        self.names = list(names)
+        self.collections = list(collections)
+        self.fields = tuple(f for f in fields if f[0] in columns)
+        self.columns = columns
+        self.types = list(types) if types is not None else [""] * len(self.names)
+        self.extras = list(extras) if extras is not None else [{} for _ in self.names]
+
+    def __len__(self):
+        return len(self.names)
+
+    @classmethod
+    def from_objects(cls, objs):
+        """Gather the full preset of LIGHT objects: shared fields in batch, per-type fields per light."""
+        objs = list(objs)
+        fields = available_fields()
+        rows = light_rows_for_objects(objs)
+        columns = {attr: values[rows] for attr, values in read_light_columns(fields).items()}
+        lights = [o.data for o in objs]
+        return cls([o.name for o in objs], first_collection_names(objs), fields, columns,
+                   types=[light.type for light in lights],
+                   extras=[read_per_type_fields(light) for light in lights])
+
+    @classmethod
+    def from_payload(cls, payload, fields=None):
+        """
+        Parse the JSON preset layout; entries without a collection or name are dropped.
+        Pass `fields` (from available_fields()) when parsing off the main thread.
+        """
+        fields = fields or available_fields()
+        known = {attr for attr, _size, _kind in fields} | {"name", "type"}
+        names, collections, types, extras = [], [], [], []
+        values = {attr: [] for attr, _size, _kind in fields}
+        for entry in payload or []:
+            cname = entry.get("collection", "")
+            items = entry.get("preset", [])
+            if not cname or not items:
+                continue
+            for item in items:
+                name = item.get("name", "")
+                if not name:
+                    continue
+                names.append(name)
+                collections.append(cname)
+                types.append(item.get("type", ""))
+                extras.append({k: v for k, v in item.items() if k not in known})
+                for attr, size, _kind in fields:
+                    value = item.get(attr, LEGACY_DEFAULTS.get(attr))
+                    if value is None:
+                        value = [np.nan] * size
+                    values[attr].append(value)
+
+        columns = {attr: np.array(values[attr], dtype=np.float64).reshape(len(names), size)
+                   for attr, size, _kind in fields}
+        return cls(names, collections, fields, columns, types, extras)
+
+    @classmethod
+    def from_arrays(cls, arrays, fields=None):
+        """Build a table from the columnar .npz layout written by to_arrays()."""
+        fields = fields or available_fields()
+        names = arrays["names"].tolist()
+        count = len(names)
+        columns = {}
+        for attr, size, _kind in fields:
+            if attr in arrays:
+                columns[attr] = arrays[attr].astype(np.float64).reshape(count, size)
+            else:
+                default = np.asarray(LEGACY_DEFAULTS.get(attr, np.nan), dtype=np.float64)
+                columns[attr] = np.broadcast_to(default, (count, size)).copy()
+        # Version 1 files only carry the shared columns
+        types = arrays["types"].tolist() if "types" in arrays else None
+        extras = [json.loads(e) for e in arrays["extras"].tolist()] if "extras" in arrays else [{} for _ in names]
+        # Version 2 files also stored boolean toggles as columns; they are per-light fields now
+        known = {attr for attr, _size, _kind in fields} | set(NPZ_TABLE_KEYS)
+        for attr in [k for k in arrays.keys() if k not in known and count]:
+            col = arrays[attr].reshape(count, -1).tolist()
+            for extra, row in zip(extras, col):
+                extra.setdefault(attr, row[0] if len(row) == 1 else row)
+        return cls(names, arrays["collections"].tolist(), fields, columns, types, extras)
+
+    def to_arrays(self):
+        """Return the columnar .npz layout: name/collection/type tables plus packed float32 fields."""
+        arrays = {
+            "version": np.array(NPZ_FORMAT_VERSION),
+            "names": np.array(self.names, dtype=str),
+            "collections": np.array(self.collections, dtype=str),
+            "types": np.array(self.types, dtype=str),
+            # Per-type fields are sparse and mixed-type; one compact JSON string per row
+            "extras": np.array([json.dumps(e, separators=(",", ":")) for e in self.extras], dtype=str),
+        }
+        for attr, col in self.columns.items():
+            arrays[attr] = np.ascontiguousarray(col, dtype=np.float32)
+        return arrays
+
+    def to_payload(self):
+        """Return the JSON preset layout: [{"collection": name, "preset": [item, ...]}]."""
+        # Convert each column to Python values once instead of per item
+        values = {}
+        for attr, size, kind in self.fields:
+            col = self.columns[attr]
+            gaps = np.isnan(col).any(axis=1).tolist()
+            values[attr] = [None if gap else to_python(row, size, kind)
+                            for row, gap in zip(col.tolist(), gaps)]
+
+        by_collection = {}
+        for i, (name, cname) in enumerate(zip(self.names, self.collections)):
+            item = {"name": name}
+            if self.types[i]:
+                item["type"] = self.types[i]
+            for attr, col in values.items():
+                if col[i] is not None:
+                    item[attr] = col[i]
+            item.update(self.extras[i])
+            by_collection.setdefault(cname, []).append(item)
+
+        return [{"collection": cname, "preset": items} for cname, items in by_collection.items()]
+
+
+# ------------------------------------------------------------------------
+# Preset Files
+# ------------------------------------------------------------------------
+def is_npz_path(filepath: str) -> bool:
+    return filepath.lower().endswith(".npz")
+
+
+def load_preset_table(filepath, fields=None):
+    """
+    Load a .json or .npz preset into a LightPresetTable, or None on failure.
+    Does not touch bpy when `fields` is given, so it can run on a worker thread.
+    """
+    if is_npz_path(filepath):
+        arrays = NPZManager.load_npz(filepath)
+        if arrays is None:
+            return None
+        try:
+            return LightPresetTable.from_arrays(arrays, fields)
+        except (KeyError, ValueError) as e:
+            print(f"Error reading preset columns from {filepath}: {e}")
+            return None
+    payload = JSONManager.load_json(filepath)
+    return LightPresetTable.from_payload(payload, fields) if payload is not None else None
+
+
+def save_preset_table(table, filepath, compress=True):
+    """Save a LightPresetTable as .npz or .json depending on the file extension."""
+    if is_npz_path(filepath):
+        NPZManager.save_npz(table.to_arrays(), filepath, compress=compress)
+    else:
+        JSONManager.save_json(data=table.to_payload(), filepath=filepath)
+
+
+# ------------------------------------------------------------------------
+# Apply
+# ------------------------------------------------------------------------
+def is_writable_light(light) -> bool:
+    """Linked lights and non-editable (system) overrides reject writes; the import skips them."""
+    if light.library is not None:
+        return False
+    override = light.override_library
+    return override is None or not override.is_system_override
+
+
+def resolve_preset_lights(table):
+    """
+    Match table rows to LIGHT objects in their named collection whose light data can be written.
+    Returns (row indices, objects, skipped count, missing collection names); rows whose light
+    is missing or read-only (see is_writable_light) count as skipped.
+    """
+    rows, objs, skipped, missing = [], [], 0, []
+    by_name = {}  # collection name -> {object name: light object}, built once per collection
+    for i, (name, cname) in enumerate(zip(table.names, table.collections)):
+        index = by_name.get(cname)
+        if index is None:
+            coll = bpy.data.collections.get(cname)
+            if coll is None:
+                missing.append(cname)
+                index = by_name[cname] = {}
+            else:
+                index = by_name[cname] = {o.name: o for o in coll.objects
+                                          if o.type == 'LIGHT' and o.data is not None}
+        obj = index.get(name)
+        if obj is None or not is_writable_light(obj.data):
+            skipped += 1
+            continue
+        rows.append(i)
+        objs.append(obj)
+    return np.array(rows, dtype=np.int64), objs, skipped, missing
+
+
+def read_table_fields(table):
+    """Current values of every Light datablock for the shared fields the table carries."""
+    return read_light_columns(table.fields)
+
+
+def diff_light_columns(table, rows, light_rows, current):
+    """
+    Compare table rows against current light values; pure NumPy, safe off the main thread.
+    Returns (changed mask per resolved row, {attr: (diff mask, desired values)}).
+    Fields the preset leaves out (NaN) keep the current value.
+    """
+    field_changes = {}
+    changed = np.zeros(len(rows), dtype=bool)
+    for attr, _size, kind in table.fields:
+        desired = table.columns[attr][rows]
+        if kind == 'FLOAT':
+            # Diff in float32, the precision the values are stored at
+            desired = desired.astype(np.float32).astype(np.float64)
+        present = ~np.isnan(desired)
+        now = current[attr][light_rows]
+        diff = ((now != desired) & present).any(axis=1)
+        if diff.any():
+            field_changes[attr] = (diff, np.where(present, desired, now))
+            changed |= diff
+    return changed, field_changes
+
+
+def diff_light_extras(table, rows, objs):
+    """
+    Compare per-type fields against each resolved light; reads RNA, so main thread only.
+    Rows saved from a different light type are left alone.
+    Returns {resolved position: {attr: (current value, preset value)}}.
+    """
+    changes = {}
+    for k, i in enumerate(rows.tolist()):
+        extra = table.extras[i]
+        light = objs[k].data
+        if not extra or (table.types[i] and table.types[i] != light.type):
+            continue
+        per_row = {}
+        for attr, size, kind in light_schema(light.type):
+            if attr not in extra:
+                continue
+            current = to_python(getattr(light, attr), size, kind)
+            # Cast the preset value too: older .npz files stored booleans as float columns
+            wanted = to_python(extra[attr], size, kind)
+            if _values_differ(current, wanted, kind):
+                per_row[attr] = (current, wanted)
+        if per_row:
+            changes[k] = per_row
+    return changes
+
+
+def write_light_extras(light, values):
+    """Set per-type fields on one light, skipping values this Blender build rejects."""
+    for attr, value in values.items():
+        try:
+            setattr(light, attr, value)
+        except (TypeError, ValueError, AttributeError) as e:
+            print(f"Could not set '{attr}' on light '{light.name}': {e}")
+
+
+def apply_light_preset(table, dry_run=False):
+    """
+    Write a preset table onto the matching lights, touching only lights whose values differ.
+    Shared fields go back through one foreach_set per field over bpy.data.lights;
+    per-type fields are set only where they changed.
+    Returns a stats dict: changed, unchanged, skipped, missing_collections.
+    """
+    rows, objs, skipped, missing = resolve_preset_lights(table)
+    stats = {"changed": 0, "unchanged": len(objs), "skipped": skipped, "missing_collections": missing}
+    if not objs:
+        return stats
+
+    light_rows = light_rows_for_objects(objs)
+    current = read_table_fields(table)
+    changed, field_changes = diff_light_columns(table, rows, light_rows, current)
+    extra_changes = diff_light_extras(table, rows, objs)
+    if extra_changes:
+        changed[list(extra_changes)] = True
+
+    stats["changed"] = int(changed.sum())
+    stats["unchanged"] = len(objs) - stats["changed"]
+    if dry_run or not stats["changed"]:
+        return stats
+
+    kinds = {attr: kind for attr, _size, kind in table.fields}
+    for attr, (diff, desired) in field_changes.items():
+        values = current[attr]
+        values[light_rows[diff]] = desired[diff]
+        write_light_column(attr, kinds[attr], values)
+
+    for k, per_row in extra_changes.items():
+        write_light_extras(objs[k].data, {attr: new for attr, (_old, new) in per_row.items()})
+
+    # foreach_set skips RNA updates; tag only what changed so the depsgraph re-evaluates once
+    for i in np.flatnonzero(changed).tolist():
+        objs[i].data.update_tag()
+    return stats
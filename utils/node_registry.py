@@ -0,0 +1,146 @@
+import bpy
+from collections import namedtuple
+from . import handlers
+
+
+# ------------------------------------------------------------------------
+# Controls
+# ------------------------------------------------------------------------
+# One row per named node the Lighting Properties panel exposes.
+#   section:  panel box the control is drawn in
+#   material: material name holding the node, or None for the scene compositor
+#   node:     node name inside that tree
+#   kind:     'RAMP' (node.color_ramp), 'SOCKETS' (input default values) or 'PROP' (node attribute)
+#   fields:   for SOCKETS, ((input index, text), ...); for PROP, ((attribute, text), ...)
+NodeControl = namedtuple("NodeControl", "section material node kind fields label")
+
+NODE_CONTROLS = (
+    NodeControl('AO', None, "Occlusion_Thickness", 'RAMP', (), "AO Thickness Ramp:"),
+    NodeControl('MIST', None, "Mist_Controller", 'RAMP', (), "Mist Controller Ramp:"),
+    NodeControl('DOF', None, "Dof_Range", 'SOCKETS',
+                ((1, "From Min"), (2, "From Max"), (3, "To Min"), (4, "To Max")), "DOF Range:"),
+    NodeControl('DOF', None, "Dof_Intensity", 'RAMP', (), "DOF Intensity Ramp:"),
+    NodeControl('DOF', None, "Defocus", 'PROP', (("z_scale", "Z-Scale"),), "Defocus Z-Scale:"),
+    NodeControl('FOG', "Fog", "Underwater_Fog_Color", 'RAMP', (), "Underwater Fog Color Ramp:"),
+)
+
+
+# ------------------------------------------------------------------------
+# Helpers
+# ------------------------------------------------------------------------
+def get_compositor_tree(scene: bpy.types.Scene):
+    """Return the scene's compositor node tree, or None safely."""
+    if not scene:
+        return None
+    # In Blender 3.x/4.x, the compositor lives on the scene's node_tree
+    tree = getattr(scene, "node_tree", None)
+    return tree if tree and isinstance(tree, bpy.types.NodeTree) else None
+
+
+def get_material_node_tree(mat: bpy.types.Material):
+    """Return the material's node tree, or None safely."""
+    if not mat:
+        return None
+    # In all modern Blender versions, materials can have node trees when use_nodes is True
+    if not getattr(mat, "use_nodes", False):
+        return None
+    tree = getattr(mat, "node_tree", None)
+    return tree if tree and isinstance(tree, bpy.types.NodeTree) else None
+
+
+def _tree_for(scene, material_name):
+    if material_name is None:
+        return get_compositor_tree(scene)
+    return get_material_node_tree(bpy.data.materials.get(material_name))
+
+
+def _pointer(id_):
+    return id_.as_pointer() if id_ is not None else 0
+
+
+# ------------------------------------------------------------------------
+# Node Registry
+# ------------------------------------------------------------------------
+class NodeRegistry:
+    """
+    Remembers which named nodes of NODE_CONTROLS exist, per scene and node tree.
+    Only names are cached: nodes are fetched with tree.nodes.get on every call, so a node
+    removed without a depsgraph update never leaves a dangling handle behind. Controls whose
+    node is missing are answered without searching the tree again.
+    The cache is dropped when a scene, node tree or material changes and on load/undo/redo.
+    """
+
+    def __init__(self, controls=NODE_CONTROLS):
+        self.controls = controls
+        self._cache = {}  # scene name -> (tree pointers, {(material, node) keys that resolved})
+
+    def handles(self, scene):
+        """Return {(material, node name): node or None} for every control."""
+        trees = {material: _tree_for(scene, material)
+                 for material in {c.material for c in self.controls}}
+        pointers = tuple(sorted((m or "", _pointer(t)) for m, t in trees.items()))
+
+        cached = self._cache.get(scene.name_full)
+        found = cached[1] if cached is not None and cached[0] == pointers else None
+
+        resolved = {}
+        for c in self.controls:
+            key = (c.material, c.node)
+            tree = trees[c.material]
+            resolved[key] = tree.nodes.get(c.node) if tree and (found is None or key in found) else None
+        if found is None:
+            self._cache[scene.name_full] = (pointers, {k for k, node in resolved.items() if node is not None})
+        return resolved
+
+    def node(self, scene, node_name: str, material: str | None = None):
+        """Return the registered node, resolving it on first use."""
+        handles = self.handles(scene)
+        key = (material, node_name)
+        if key in handles:
+            return handles[key]
+        # Not in the table: plain lookup, uncached
+        tree = _tree_for(scene, material)
+        return tree.nodes.get(node_name) if tree else None
+
+    def invalidate(self):
+        self._cache.clear()
+
+
+registry = NodeRegistry()
+
+
+def find_custom_node(scene: bpy.types.Scene, node_name):
+    """Return the compositor node with the given name if it exists."""
+    if not scene:
+        return None
+    return registry.node(scene, node_name)
+
+
+def find_material_node(mat: bpy.types.Material, node_name: str):
+    """Return the node with the given name from the material's node tree, or None safely."""
+    tree = get_material_node_tree(mat)
+    if not tree:
+        return None
+    return tree.nodes.get(node_name)
+
+
+def get_thickness_socket(scene: bpy.types.Scene):
+    """Return Occlusion_Thickness.inputs[0] of the scene's compositor, or None if missing."""
+    node = find_custom_node(scene, "Occlusion_Thickness")
+    if node and len(node.inputs) > 0:
+        return node.inputs[0]
+    return None
+
+
+@handlers.on_depsgraph_update
+def _on_depsgraph_update(scene, depsgraph):
+    for update in depsgraph.updates:
+        # Scene updates cover a compositor tree being swapped or use_nodes being toggled
+        if isinstance(update.id, (bpy.types.NodeTree, bpy.types.Material, bpy.types.Scene)):
+            registry.invalidate()
+            return
+
+
+@handlers.on_reset
+def _on_reset():
+    registry.invalidate()
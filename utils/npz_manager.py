@@ -0,0 +1,30 @@
+import numpy as np
+from pathlib import Path
+
+
+class NPZManager:
+    """A utility class for loading and saving columnar data as NumPy .npz archives."""
+
+    @staticmethod
+    def load_npz(filepath):
+        """Load every array stored in the .npz file at filepath into a dict."""
+        try:
+            # Pickles are never needed for our string/float columns; refuse them
+            with np.load(filepath, allow_pickle=False) as archive:
+                data = {name: archive[name] for name in archive.files}
+            return data
+        except Exception as e:
+            print(f"Error loading NPZ from {filepath}: {e}")
+            return None
+
+    @staticmethod
+    def save_npz(arrays, filepath, compress=True):
+        """Save a dict of arrays to filepath, zlib-compressed unless compress is False."""
+        try:
+            Path(filepath).parent.mkdir(parents=True, exist_ok=True)
+            save = np.savez_compressed if compress else np.savez
+            with open(filepath, 'wb') as f:
+                save(f, **arrays)
+            print(f"Data successfully saved to {filepath}")
+        except Exception as e:
+            print(f"Error saving NPZ to {filepath}: {e}")
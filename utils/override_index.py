@@ -0,0 +1,56 @@
+import bpy
+
+
+# ------------------------------------------------------------------------
+# Override Index
+# ------------------------------------------------------------------------
+class OverrideIndex:
+    """
+    reference -> library override lookup for collections and objects.
+
+    Built with one pass over bpy.data when an operator starts, then kept current by
+    registering every override the operator creates, so each lookup is a dict hit instead
+    of a scan of bpy.data.collections/objects. Only valid for the operator run that made it.
+    """
+
+    POOLS = ("collections", "objects")
+
+    def __init__(self):
+        self._by_reference = {}  # reference.as_pointer() -> override ID
+        self.build()
+
+    def build(self):
+        self._by_reference.clear()
+        for pool in self.POOLS:
+            for candidate in getattr(bpy.data, pool):
+                self.add(candidate)
+
+    def add(self, override):
+        """Register one ID if it is a library override; the first override of a reference wins."""
+        ol = getattr(override, "override_library", None)
+        reference = getattr(ol, "reference", None) if ol else None
+        if reference is not None:
+            self._by_reference.setdefault(reference.as_pointer(), override)
+
+    def add_hierarchy(self, root):
+        """Register the overrides of a freshly overridden collection tree (collections and objects)."""
+        stack, seen = [root], set()
+        while stack:
+            col = stack.pop()
+            key = col.as_pointer()
+            if key in seen:
+                continue
+            seen.add(key)
+            self.add(col)
+            for obj in col.objects:
+                self.add(obj)
+            stack.extend(col.children)
+
+    def get(self, idblock):
+        """Return the override that points to 'idblock' as its reference, if any."""
+        if idblock is None:
+            return None
+        return self._by_reference.get(idblock.as_pointer())
+
+    def __len__(self):
+        return len(self._by_reference)
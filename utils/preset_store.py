@@ -0,0 +1,120 @@
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from .light_preset import LightPresetTable
+
+
+class PresetStore:
+    """
+    Content-addressed history of lighting presets.
+
+    Every collection's preset block is hashed and written once under chunks/; a snapshot is a
+    small manifest mapping collection names to chunk hashes. Re-exporting unchanged characters
+    only writes a new manifest, and restoring reads just the chunks it needs.
+
+        <root>/chunks/<ab>/<sha1>.json
+        <root>/snapshots/<snapshot id>.json
+    """
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.chunk_dir = self.root / "chunks"
+        self.snapshot_dir = self.root / "snapshots"
+
+    # --------------------------------------------------------------------
+    # Chunks
+    # --------------------------------------------------------------------
+    @staticmethod
+    def encode_block(items) -> bytes:
+        """Canonical bytes of one collection's preset items, so equal content hashes equally."""
+        return json.dumps(items, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+    def chunk_path(self, digest: str) -> Path:
+        return self.chunk_dir / digest[:2] / f"{digest}.json"
+
+    def put_chunk(self, items):
+        """Store a preset block if it is new. Returns (digest, written)."""
+        data = self.encode_block(items)
+        digest = hashlib.sha1(data).hexdigest()
+        path = self.chunk_path(digest)
+        if path.exists():
+            return digest, False
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        return digest, True
+
+    def get_chunk(self, digest: str):
+        return json.loads(self.chunk_path(digest).read_bytes())
+
+    # --------------------------------------------------------------------
+    # Snapshots
+    # --------------------------------------------------------------------
+    def save_snapshot(self, table: LightPresetTable, label: str = ""):
+        """Save a table as a snapshot. Returns (manifest, chunks written, chunks reused)."""
+        collections = {}
+        written = reused = 0
+        for entry in table.to_payload():
+            digest, is_new = self.put_chunk(entry["preset"])
+            collections[entry["collection"]] = digest
+            written += is_new
+            reused += not is_new
+
+        created = time.time()
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(created))
+        content = hashlib.sha1(json.dumps(collections, sort_keys=True).encode("utf-8")).hexdigest()[:8]
+        manifest = {
+            "id": f"{stamp}-{content}",
+            "created": created,
+            "label": label,
+            "lights": len(table),
+            "collections": collections,
+        }
+
+        self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+        path = self.snapshot_dir / f"{manifest['id']}.json"
+        path.write_text(json.dumps(manifest, ensure_ascii=False, indent=4), encoding="utf-8")
+        return manifest, written, reused
+
+    def list_snapshots(self):
+        """Return every snapshot manifest, newest first."""
+        if not self.snapshot_dir.is_dir():
+            return []
+        manifests = []
+        for path in self.snapshot_dir.glob("*.json"):
+            try:
+                manifest = json.loads(path.read_text(encoding="utf-8"))
+            except Exception as e:
+                print(f"Error reading snapshot {path}: {e}")
+                continue
+            if isinstance(manifest, dict) and manifest.get("id"):
+                manifests.append(manifest)
+            else:
+                print(f"Skipping malformed snapshot manifest {path}")
+        manifests.sort(key=lambda m: m.get("created", 0), reverse=True)
+        return manifests
+
+    def delete_snapshot(self, snapshot_id: str) -> bool:
+        """Remove a snapshot's manifest. Chunks stay, since other snapshots may share them."""
+        path = self.snapshot_dir / f"{snapshot_id}.json"
+        if not path.is_file():
+            return False
+        path.unlink()
+        return True
+
+    def load_manifest(self, snapshot_id: str):
+        path = self.snapshot_dir / f"{snapshot_id}.json"
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def load_snapshot(self, snapshot_id: str, collections=None) -> LightPresetTable:
+        """Rebuild a snapshot's table, reading only the chunks of `collections` (default: all)."""
+        manifest = self.load_manifest(snapshot_id)
+        payload = []
+        for cname, digest in manifest.get("collections", {}).items():
+            if collections is not None and cname not in collections:
+                continue
+            payload.append({"collection": cname, "preset": self.get_chunk(digest)})
+        return LightPresetTable.from_payload(payload)
@@ -0,0 +1,159 @@
+import bpy
+from typing import NamedTuple
+from . import handlers
+from .constants import ADDON_ID
+from .instancer_index import collection_ref
+from .light_index import object_ref
+
+
+# ------------------------------------------------------------------------
+# Rig Scoring
+# ------------------------------------------------------------------------
+class RigScoring(NamedTuple):
+    """
+    Weights for ranking likely rigs (configurable in the add-on preferences):
+      name_score  if the name contains one of name_keywords or starts with one of name_prefixes
+      bones_score if the armature has at least one bone
+      props_score if the object has any custom properties (often true for rig controllers)
+    Higher is better.
+    """
+    name_keywords: tuple = ("rig",)
+    name_prefixes: tuple = ("rg",)
+    name_score: int = 2
+    bones_score: int = 1
+    props_score: int = 1
+
+    @classmethod
+    def from_preferences(cls, prefs):
+        def words(text):
+            return tuple(w.strip().lower() for w in text.split(",") if w.strip())
+
+        return cls(words(prefs.rig_name_keywords), words(prefs.rig_name_prefixes),
+                   prefs.rig_name_score, prefs.rig_bones_score, prefs.rig_props_score)
+
+    def score(self, obj) -> int:
+        score = 0
+        name_l = obj.name.lower()
+        if any(k in name_l for k in self.name_keywords) or name_l.startswith(self.name_prefixes):
+            score += self.name_score
+        if obj.data and len(getattr(obj.data, "bones", ())) > 0:
+            score += self.bones_score
+        if len(obj.keys()) > 0:
+            score += self.props_score
+        return score
+
+
+def get_scoring() -> RigScoring:
+    """Current scoring weights from the add-on preferences, or the defaults if they are unavailable."""
+    addon = bpy.context.preferences.addons.get(ADDON_ID)
+    prefs = getattr(addon, "preferences", None)
+    if prefs is None or not hasattr(prefs, "rig_name_keywords"):
+        return RigScoring()
+    return RigScoring.from_preferences(prefs)
+
+
+# ------------------------------------------------------------------------
+# Rig Index
+# ------------------------------------------------------------------------
+class RigIndex:
+    """
+    Collection -> armatures under it (recursively), best rig first, for every collection in the file.
+
+    Every armature is scored once per build and propagated up to all collections that hold it,
+    directly or through child collections, so each 'c-' character collection maps to its preferred
+    rig without walking its all_objects. Entries hold name refs and are resolved when read.
+    """
+
+    def __init__(self):
+        self.rigs = {}  # collection ref -> [rig ref], best first
+        self.scores = {}  # rig ref -> score
+        self.scoring = None
+        self.stale = True
+        self.object_count = -1
+
+    def rebuild(self, scoring: RigScoring):
+        self.rigs.clear()
+        self.scores.clear()
+        parents = {}  # collection pointer -> parent collections
+        for coll in bpy.data.collections:
+            for child in coll.children:
+                parents.setdefault(child.as_pointer(), []).append(coll)
+
+        for obj in bpy.data.objects:
+            if obj.type != 'ARMATURE':
+                continue
+            ref = object_ref(obj)
+            self.scores[ref] = scoring.score(obj)
+            # Every collection above the rig's own collections, each once
+            stack, seen = list(obj.users_collection), set()
+            while stack:
+                coll = stack.pop()
+                key = coll.as_pointer()
+                if key in seen:
+                    continue
+                seen.add(key)
+                self.rigs.setdefault(collection_ref(coll), []).append(ref)
+                stack.extend(parents.get(key, ()))
+
+        for refs in self.rigs.values():
+            refs.sort(key=lambda r: (-self.scores[r], r[0]))
+        self.scoring = scoring
+        self.object_count = len(bpy.data.objects)
+        self.stale = False
+
+    def ensure(self):
+        """Rebuild if marked stale, objects were added/removed or the scoring preferences changed."""
+        scoring = get_scoring()
+        if self.stale or self.object_count != len(bpy.data.objects) or scoring != self.scoring:
+            self.rebuild(scoring)
+        return self
+
+    def rigs_in(self, coll) -> list:
+        """Armature objects under 'coll' (recursive), best-scored first."""
+        rigs = []
+        for ref in self.rigs.get(collection_ref(coll), ()):
+            rig = bpy.data.objects.get(ref)
+            if rig is None or rig.type != 'ARMATURE':
+                # Removed or renamed since the build; the next build picks up the new state
+                self.stale = True
+                continue
+            rigs.append(rig)
+        return rigs
+
+    def preferred(self, coll):
+        """The best-scored rig under 'coll', or None."""
+        rigs = self.rigs_in(coll)
+        return rigs[0] if rigs else None
+
+
+_index = RigIndex()
+
+
+def get_rig_index() -> RigIndex:
+    """Return the shared, up-to-date rig index."""
+    return _index.ensure()
+
+
+def invalidate():
+    """Force a rebuild on next access."""
+    _index.stale = True
+
+
+@handlers.on_depsgraph_update
+def _on_depsgraph_update(scene, depsgraph):
+    if _index.stale:
+        return
+    for update in depsgraph.updates:
+        id_ = update.id
+        # Membership changes show up as Collection updates, bone edits as Armature updates. Renames and
+        # custom property edits are rig updates without transform/geometry flags; posing and animation are not
+        if isinstance(id_, (bpy.types.Collection, bpy.types.Armature)) or \
+                (isinstance(id_, bpy.types.Object) and id_.type == 'ARMATURE'
+                 and not (update.is_updated_transform or update.is_updated_geometry)):
+            _index.stale = True
+            return
+
+
+@handlers.on_reset
+def _on_reset():
+    invalidate()
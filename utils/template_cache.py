@@ -0,0 +1,256 @@
+import bpy
+import os
+from . import handlers
+
+# Names of cached template IDs carry this tag, so copies can take back the original names
+TEMPLATE_TAG = "~template"
+SOURCE_PROP = "blt_template_source"
+MTIME_PROP = "blt_template_mtime"
+
+
+# ------------------------------------------------------------------------
+# Helpers
+# ------------------------------------------------------------------------
+def untag(name: str) -> str:
+    """Original name of a template ID ('l-fill~template' -> 'l-fill')."""
+    return name.split(TEMPLATE_TAG, 1)[0]
+
+
+def _source_mtime(filepath) -> str:
+    # Nanosecond mtime as a string: exact, and storable as an ID property
+    return str(os.stat(filepath).st_mtime_ns)
+
+
+def iter_collection_tree(root):
+    """Yield root and every collection below it once (collections can have several parents)."""
+    stack, seen = [root], set()
+    while stack:
+        coll = stack.pop()
+        key = coll.as_pointer()
+        if key in seen:
+            continue
+        seen.add(key)
+        yield coll
+        stack.extend(coll.children)
+
+
+def _remap_pointers(struct, id_map):
+    """Point every writable ID pointer of an RNA struct at its copy in id_map, if it has one."""
+    for prop in struct.bl_rna.properties:
+        if prop.type != 'POINTER' or prop.is_readonly:
+            continue
+        value = getattr(struct, prop.identifier, None)
+        if not isinstance(value, bpy.types.ID):
+            continue
+        copy = id_map.get(value.as_pointer())
+        if copy is not None:
+            try:
+                setattr(struct, prop.identifier, copy)
+            except (AttributeError, TypeError, ValueError):
+                pass
+
+
+def deep_duplicate_collection(root, rename=untag, journal=None):
+    """
+    Duplicate a collection tree in memory: collections, objects and object data are copied,
+    and references between them (parents, constraint/modifier targets, light linking) are
+    remapped onto the copies. Data shared inside the tree stays shared between the copies.
+    Every copy is recorded in 'journal' (an IDJournal), if given.
+    Returns the new, unlinked root collection.
+    """
+    id_map = {}  # original pointer -> copy (collections and objects)
+    data_map = {}  # original data pointer -> copied data
+    tree = list(iter_collection_tree(root))
+
+    for coll in tree:
+        new = coll.copy()
+        new.name = rename(coll.name)
+        for prop in (SOURCE_PROP, MTIME_PROP):
+            if prop in new:
+                del new[prop]
+        # copy() keeps the original links; they are replaced by the copies below
+        for child in list(new.children):
+            new.children.unlink(child)
+        for obj in list(new.objects):
+            new.objects.unlink(obj)
+        id_map[coll.as_pointer()] = new
+        if journal is not None:
+            journal.record_created(new)
+
+    new_objects = []
+    for coll in tree:
+        new = id_map[coll.as_pointer()]
+        for child in coll.children:
+            new.children.link(id_map[child.as_pointer()])
+        for obj in coll.objects:
+            copy = id_map.get(obj.as_pointer())
+            if copy is None:
+                copy = id_map[obj.as_pointer()] = obj.copy()
+                copy.name = rename(obj.name)
+                if obj.data is not None:
+                    key = obj.data.as_pointer()
+                    if key not in data_map:
+                        data_map[key] = obj.data.copy()
+                        data_map[key].name = rename(obj.data.name)
+                    copy.data = data_map[key]
+                new_objects.append(copy)
+                if journal is not None:
+                    journal.record_created(copy, copy.data)
+            new.objects.link(copy)
+
+    for copy in new_objects:
+        if copy.parent is not None and copy.parent.as_pointer() in id_map:
+            matrix = copy.matrix_parent_inverse.copy()
+            copy.parent = id_map[copy.parent.as_pointer()]
+            copy.matrix_parent_inverse = matrix
+        for con in copy.constraints:
+            _remap_pointers(con, id_map)
+        for mod in copy.modifiers:
+            _remap_pointers(mod, id_map)
+        linking = getattr(copy, "light_linking", None)
+        if linking is not None:
+            _remap_pointers(linking, id_map)
+
+    return id_map[root.as_pointer()]
+
+
+# ------------------------------------------------------------------------
+# Template Cache
+# ------------------------------------------------------------------------
+def _template_name(collection_name: str) -> str:
+    return f"{collection_name}{TEMPLATE_TAG}"
+
+
+def _is_template(coll) -> bool:
+    return coll.library is None and SOURCE_PROP in coll
+
+
+def discard_template(template):
+    """Remove a cached template with its objects and any object data nothing else uses."""
+    tree = list(iter_collection_tree(template))
+    objects = {o.as_pointer(): o for coll in tree for o in coll.objects}
+    datas = {o.data.as_pointer(): o.data for o in objects.values() if o.data is not None}
+    bpy.data.batch_remove(tree + list(objects.values()))
+    orphans = [d for d in datas.values() if d.users == 0]
+    if orphans:
+        bpy.data.batch_remove(orphans)
+
+
+def discard_templates():
+    """Remove every cached template in the file."""
+    for coll in [c for c in bpy.data.collections if _is_template(c)]:
+        discard_template(coll)
+
+
+def get_template(filepath: str, collection_name: str):
+    """
+    Return the cached, unlinked template copy of 'collection_name' from the .blend at 'filepath',
+    loading it on first use or when the file changed on disk since it was cached.
+    Raises RuntimeError when the collection is missing from the file.
+    """
+    mtime = _source_mtime(filepath)
+    template = bpy.data.collections.get(_template_name(collection_name))
+    if template is not None and _is_template(template):
+        if template.get(SOURCE_PROP) == filepath and template.get(MTIME_PROP) == mtime:
+            return template
+        discard_template(template)
+
+    with bpy.data.libraries.load(filepath, link=False) as (data_from, data_to):
+        if collection_name not in data_from.collections:
+            raise RuntimeError(f"No '{collection_name}' collection found in the blend file.")
+        data_to.collections = [collection_name]
+    template = data_to.collections[0]
+    if template is None:
+        raise RuntimeError(f"Could not load '{collection_name}' from {filepath}.")
+
+    # Tag every name so copies can take the original names while the template is cached
+    for coll in iter_collection_tree(template):
+        coll.name = coll.name + TEMPLATE_TAG
+        for obj in coll.objects:
+            if TEMPLATE_TAG not in obj.name:
+                obj.name = obj.name + TEMPLATE_TAG
+    template[SOURCE_PROP] = filepath
+    template[MTIME_PROP] = mtime
+    return template
+
+
+def instantiate_template(filepath: str, collection_name: str, journal=None):
+    """Return a fresh, unlinked deep copy of the cached template (see get_template)."""
+    return deep_duplicate_collection(get_template(filepath, collection_name), journal=journal)
+
+
+# ------------------------------------------------------------------------
+# Linked Template (library override mode)
+# ------------------------------------------------------------------------
+_linked_mtimes = {}  # source filepath -> mtime it was linked/reloaded at
+
+
+def _find_library(filepath):
+    wanted = os.path.normcase(os.path.normpath(filepath))
+    for lib in bpy.data.libraries:
+        if os.path.normcase(os.path.normpath(bpy.path.abspath(lib.filepath))) == wanted:
+            return lib
+    return None
+
+
+def get_linked_template(filepath: str, collection_name: str):
+    """
+    Return 'collection_name' linked (not appended) from the .blend at 'filepath'.
+    Every character's override shares this one linked copy; the library is reloaded
+    when the file changed on disk since it was linked. Raises RuntimeError when missing.
+    """
+    mtime = _source_mtime(filepath)
+    lib = _find_library(filepath)
+    if lib is not None:
+        if _linked_mtimes.get(filepath, mtime) != mtime:
+            lib.reload()
+        _linked_mtimes[filepath] = mtime
+        linked = bpy.data.collections.get((collection_name, lib.filepath))
+        if linked is not None:
+            return linked
+
+    with bpy.data.libraries.load(filepath, link=True) as (data_from, data_to):
+        if collection_name not in data_from.collections:
+            raise RuntimeError(f"No '{collection_name}' collection found in the blend file.")
+        data_to.collections = [collection_name]
+    linked = data_to.collections[0]
+    if linked is None:
+        raise RuntimeError(f"Could not link '{collection_name}' from {filepath}.")
+    _linked_mtimes[filepath] = mtime
+    return linked
+
+
+def instantiate_override(filepath: str, collection_name: str, scene, view_layer, journal=None):
+    """
+    Return a new library override hierarchy of the linked template, unlinked from the scene.
+    Light data stays linked and shared; only the properties an artist changes are stored.
+    A library linked by this call is recorded in 'journal' too, so a rollback does not leave it behind.
+    """
+    newly_linked = _find_library(filepath) is None
+    linked = get_linked_template(filepath, collection_name)
+    if journal is not None and newly_linked:
+        # Nothing else uses a library linked just now; removing it also drops its linked IDs
+        journal.record_created(linked.library)
+    override = linked.override_hierarchy_create(scene, view_layer)
+    if override is None:
+        raise RuntimeError(f"Could not create a library override of '{collection_name}'.")
+    if journal is not None:
+        journal.record_tree(override)
+    # override_hierarchy_create instances the override under the scene root; callers link it where they want
+    try:
+        scene.collection.children.unlink(override)
+    except RuntimeError:
+        pass
+    return override
+
+
+@handlers.on_reset
+def _on_reset():
+    # A loaded file links its libraries fresh; forget the previous file's link times
+    _linked_mtimes.clear()
+
+
+@handlers.on_save_pre
+def _on_save_pre():
+    # Templates are a session cache; keep them out of saved files
+    discard_templates()